@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Temporal Backend Benchmark
+Compares access-recording throughput of the in-memory, SQLite (WAL) and
+Postgres storage backends of the temporal engine
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from importlib.util import spec_from_file_location, module_from_spec
+from typing import Dict, Any
+
+def load_temporal_module():
+    spec = spec_from_file_location(
+        "temporal_processor",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "temporal-processor.py")
+    )
+    module = module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def events_per_second(count: int, seconds: float) -> float:
+    return round(count / seconds, 1) if seconds > 0 else 0.0
+
+def run_backend(temporal, backend: str, db_path: str, dsn: str, events: int,
+                memories: int, batch_size: int, seed: int) -> Dict[str, Any]:
+    """Record the same synthetic access stream three ways and time each"""
+    rng = random.Random(seed)
+    memory_ids = [f"bench_mem_{i}" for i in range(memories)]
+    start = datetime.now() - timedelta(days=30)
+    stream = [
+        (rng.choice(memory_ids), (start + timedelta(seconds=rng.randrange(30 * 86400))).isoformat(),
+         f"context_{rng.randrange(20)}", "benchmark", "retrieval")
+        for _ in range(events)
+    ]
+    
+    engine = temporal.TemporalIntelligenceEngine(db_path=db_path, backend=backend, dsn=dsn)
+    categories = [category for category in engine.decay_table.codes if category]
+    try:
+        single_events = stream[:max(1, events // 10)]
+        single_start = time.perf_counter()
+        for memory_id, _, context, tool_source, query_type in single_events:
+            engine.record_memory_access(memory_id, context, tool_source, query_type,
+                                        category=rng.choice(categories) if categories else None)
+        single_seconds = time.perf_counter() - single_start
+        
+        batch_start = time.perf_counter()
+        for offset in range(0, events, batch_size):
+            engine.record_memory_accesses(stream[offset:offset + batch_size])
+        batch_seconds = time.perf_counter() - batch_start
+        
+        recorder = temporal.BufferedAccessRecorder(engine, batch_size=batch_size)
+        buffered_start = time.perf_counter()
+        for memory_id, _, context, tool_source, query_type in stream:
+            recorder.record(memory_id, context, tool_source, query_type)
+        enqueue_seconds = time.perf_counter() - buffered_start
+        recorder.close()
+        buffered_seconds = time.perf_counter() - buffered_start
+        
+        return {
+            "backend": backend,
+            "events": events,
+            "memories": memories,
+            "single_access_per_second": events_per_second(len(single_events), single_seconds),
+            "batched_access_per_second": events_per_second(events, batch_seconds),
+            "buffered_enqueue_per_second": events_per_second(events, enqueue_seconds),
+            "buffered_drained_per_second": events_per_second(events, buffered_seconds),
+            "batch_size": batch_size
+        }
+    finally:
+        engine.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark temporal engine storage backends")
+    parser.add_argument('--events', type=int, default=50000, help='Access events per recording mode')
+    parser.add_argument('--memories', type=int, default=5000, help='Distinct memory ids')
+    parser.add_argument('--batch-size', type=int, default=500, help='Events per batched write')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--backends', nargs='*', default=['memory', 'sqlite', 'postgres'],
+                        help='Backends to compare')
+    parser.add_argument('--dsn', default=None, help='Postgres DSN (defaults to the docker-compose service)')
+    args = parser.parse_args()
+    
+    temporal = load_temporal_module()
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for backend in args.backends:
+            db_path = os.path.join(tmp_dir, "temporal-bench.db") if backend == "sqlite" else ":memory:"
+            try:
+                results.append(run_backend(temporal, backend, db_path, args.dsn, args.events,
+                                           args.memories, args.batch_size, args.seed))
+            except (ImportError, OSError) as e:
+                # No driver or no server: report it and keep benchmarking the rest
+                results.append({"backend": backend, "skipped": str(e)})
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -13,24 +13,49 @@ from datetime import datetime
 from typing import Dict, List, Any, Optional
 import subprocess
 import os
+from importlib.util import spec_from_file_location, module_from_spec
+
+MCP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(MCP_ROOT)
+
+def load_module(name: str, relative_path: str):
+    """Import a component script by path (the file names are hyphenated)"""
+    spec = spec_from_file_location(name, os.path.join(MCP_ROOT, relative_path))
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
 
 # Import local components
-sys.path.append('/Users/josephhillin/workspace/mcp-central')
-from agents.temporal_engine.temporal_processor import TemporalIntelligenceEngine
-from graph.memory_graph_service import MemoryGraphService
-from security.audit_system import MemoryAuditSystem
-from memory_seeds.enhanced_validator import EnhancedMemoryValidator
+TemporalIntelligenceEngine = load_module(
+    "temporal_processor", "agents/temporal-engine/temporal-processor.py").TemporalIntelligenceEngine
+MemoryGraphService = load_module("memory_graph_service", "graph/memory-graph-service.py").MemoryGraphService
+MemoryAuditSystem = load_module("audit_system", "security/audit-system.py").MemoryAuditSystem
+EnhancedMemoryValidator = load_module(
+    "enhanced_validator", "memory-seeds/enhanced-validator.py").EnhancedMemoryValidator
+TeamMemoryManager = load_module("team_memory_manager", "team/team-memory-manager.py").TeamMemoryManager
 
 class MemoryCLI:
-    def __init__(self):
+    def __init__(self, user_id: str = None):
         self.base_path = "/Users/josephhillin/workspace/mcp-central"
+        # Team mode: with a user, search results are filtered by team sharing permissions
+        self.user_id = user_id
+        self.team_manager = TeamMemoryManager(f"{self.base_path}/team/team-memory.db") if user_id else None
         self.temporal_engine = TemporalIntelligenceEngine(
             config_path=f"{self.base_path}/memory-policies/temporal-schema.yaml",
             db_path=f"{self.base_path}/memory-seeds/temporal.db"
         )
-        self.graph_service = MemoryGraphService(f"{self.base_path}/graph/memory-graph.db")
+        # Lazy mode keeps CLI start-up independent of corpus size
+        self.graph_service = MemoryGraphService(f"{self.base_path}/graph/memory-graph.db", lazy=True)
         self.audit_system = MemoryAuditSystem(f"{self.base_path}/security/audit.db")
         self.validator = EnhancedMemoryValidator(f"{self.base_path}/memory-policies/temporal-schema.yaml")
+    
+    def close(self):
+        """Release database connections (and write out buffered access and team log events)"""
+        if self.team_manager:
+            self.team_manager.close()
+        self.temporal_engine.close()
+        self.graph_service.close()
         
     def add_memory(self, content: str, category: str = None, tags: List[str] = None, 
                    source: str = "cli") -> Dict[str, Any]:
@@ -71,6 +96,9 @@ class MemoryCLI:
             }
         )
         
+        # Start temporal tracking; the category drives decay, retention and review queues
+        self.temporal_engine.track_memory(memory_id, category=enhanced_category)
+        
         # Log audit trail
         self.audit_system.log_memory_operation(
             memory_id=memory_id,
@@ -100,27 +128,42 @@ class MemoryCLI:
         results = []
         try:
             # Simple keyword search in graph nodes
-            for node_id in self.graph_service.graph.nodes():
-                node_data = self.graph_service.graph.nodes[node_id]
-                content = node_data.get('content', '').lower()
+            matches = self.graph_service.search_nodes(query, category)
+            
+            if self.team_manager:
+                # One ACL snapshot check for the whole batch of hits
+                permitted = set(self.team_manager.filter_accessible(
+                    self.user_id, [node_data['memory_id'] for node_data in matches]
+                ))
+                matches = [node_data for node_data in matches if node_data['memory_id'] in permitted]
+            
+            # Score all matches in one read-only batch; persisted scores are
+            # refreshed by the temporal daemon, not by searches
+            relevance_scores = self.temporal_engine.score_memories(
+                node_data['memory_id'] for node_data in matches
+            )
+            
+            for node_data in matches:
+                node_id = node_data['memory_id']
                 
-                if query.lower() in content:
-                    if not category or node_data.get('category') == category:
-                        # Get relevance score from temporal engine
-                        relevance = self.temporal_engine.update_relevance_score(node_id)
-                        
-                        results.append({
-                            "memory_id": node_id,
-                            "content": node_data.get('content'),
-                            "category": node_data.get('category'),
-                            "tags": node_data.get('tags', []),
-                            "relevance_score": relevance
-                        })
+                results.append({
+                    "memory_id": node_id,
+                    "content": node_data.get('content'),
+                    "category": node_data.get('category'),
+                    "tags": node_data.get('tags', []),
+                    "relevance_score": relevance_scores[node_id]
+                })
             
             # Sort by relevance
             results.sort(key=lambda x: x['relevance_score'], reverse=True)
             results = results[:limit]
             
+            # Returned hits count as retrievals; queued so the search never waits on a commit
+            access_recorder = self.temporal_engine.access_recorder()
+            for result in results:
+                access_recorder.record(result["memory_id"], context=query, tool_source="memory_cli",
+                                       query_type="search", category=result["category"])
+            
             return {
                 "success": True,
                 "results": results,
@@ -150,19 +193,22 @@ class MemoryCLI:
                 "error": str(e)
             }
     
-    def export_graph(self, output_path: str = None) -> Dict[str, Any]:
+    def export_graph(self, output_path: str = None, export_format: str = "json") -> Dict[str, Any]:
         """Export memory graph for visualization"""
         try:
             if not output_path:
-                output_path = f"{self.base_path}/graph/memory-export-{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+                extension = "ndjson" if export_format == "ndjson" else "json"
+                output_path = f"{self.base_path}/graph/memory-export-{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
             
-            self.graph_service.export_graph_json(output_path)
+            # Streams rows from SQLite; the lazy graph never materializes payloads
+            export_result = self.graph_service.export_graph_json(output_path, export_format=export_format)
             
             return {
                 "success": True,
                 "export_path": output_path,
-                "node_count": len(self.graph_service.graph.nodes()),
-                "edge_count": len(self.graph_service.graph.edges())
+                "export_format": export_format,
+                "node_count": export_result["node_count"],
+                "edge_count": export_result["edge_count"]
             }
         except Exception as e:
             return {
@@ -184,16 +230,19 @@ def main():
     # Search arguments
     parser.add_argument('--query', type=str, help='Search query')
     parser.add_argument('--limit', type=int, default=10, help='Max results')
+    parser.add_argument('--user', type=str, help='Team mode: only return memories this user may access')
     
     # Export arguments
     parser.add_argument('--output', type=str, help='Output file path')
+    parser.add_argument('--export-format', choices=['json', 'compact', 'ndjson'], default='json',
+                       help='Graph export format')
     
     # Format arguments
     parser.add_argument('--format', choices=['json', 'pretty'], default='pretty', help='Output format')
     
     args = parser.parse_args()
     
-    cli = MemoryCLI()
+    cli = MemoryCLI(user_id=args.user)
     result = None
     
     try:
@@ -222,7 +271,7 @@ def main():
             result = cli.get_review_queue()
         
         elif args.command == 'export':
-            result = cli.export_graph(output_path=args.output)
+            result = cli.export_graph(output_path=args.output, export_format=args.export_format)
         
         elif args.command == 'health':
             # System health check
@@ -265,6 +314,8 @@ def main():
     except Exception as e:
         print(f"❌ Unexpected error: {e}")
         sys.exit(1)
+    finally:
+        cli.close()
 
 if __name__ == "__main__":
     main()
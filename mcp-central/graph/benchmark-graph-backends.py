@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Graph Backend Benchmark
+Compares memory footprint and traversal speed of the NetworkX and compact
+graph backends on a synthetic memory graph
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import time
+from collections import deque
+from typing import Dict, Any
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    import resource
+    PSUTIL_AVAILABLE = False
+
+RELATIONSHIP_TYPES = ["related_technology", "used_in_project", "follows", "contradicts", "extends"]
+CATEGORIES = ["project_active", "project_research", "preferences_coding", "knowledge_technical"]
+
+def current_rss_bytes() -> int:
+    """Resident set size of this process"""
+    if PSUTIL_AVAILABLE:
+        return psutil.Process().memory_info().rss
+    # ru_maxrss is a high-water mark in KB on Linux; good enough for deltas here
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def traverse(graph, start: str, max_depth: int, min_confidence: float) -> int:
+    """BFS using the same adjacency API as find_related_memories"""
+    visited = {start}
+    queue = deque([(start, 0)])
+    while queue:
+        current_id, depth = queue.popleft()
+        if depth >= max_depth:
+            continue
+        for neighbor, edge_data in graph[current_id].items():
+            if neighbor not in visited and edge_data.get('confidence', 1.0) >= min_confidence:
+                visited.add(neighbor)
+                queue.append((neighbor, depth + 1))
+    return len(visited) - 1
+
+def run_backend(backend: str, nodes: int, edges: int, queries: int, seed: int) -> Dict[str, Any]:
+    """Build a synthetic graph in this process and measure it"""
+    from importlib.util import spec_from_file_location, module_from_spec
+    spec = spec_from_file_location(
+        "memory_graph_service",
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "memory-graph-service.py")
+    )
+    service_module = module_from_spec(spec)
+    spec.loader.exec_module(service_module)
+    
+    rng = random.Random(seed)
+    baseline_rss = current_rss_bytes()
+    build_start = time.perf_counter()
+    
+    graph = service_module.MemoryGraphService.create_graph(backend)
+    graph.add_nodes_from((f"mem_{i}", {'category': rng.choice(CATEGORIES)}) for i in range(nodes))
+    graph.add_edges_from(
+        (f"mem_{rng.randrange(nodes)}", f"mem_{rng.randrange(nodes)}", {
+            'relationship_type': rng.choice(RELATIONSHIP_TYPES),
+            'confidence': rng.random(),
+            'context': ''
+        })
+        for _ in range(edges)
+    )
+    
+    build_seconds = time.perf_counter() - build_start
+    graph_rss = current_rss_bytes() - baseline_rss
+    
+    starts = [f"mem_{rng.randrange(nodes)}" for _ in range(queries)]
+    latencies = []
+    reached = 0
+    for start in starts:
+        query_start = time.perf_counter()
+        reached += traverse(graph, start, max_depth=2, min_confidence=0.5)
+        latencies.append(time.perf_counter() - query_start)
+    
+    latencies.sort()
+    return {
+        "backend": backend,
+        "nodes": graph.number_of_nodes(),
+        "edges": graph.number_of_edges(),
+        "build_seconds": round(build_seconds, 3),
+        "rss_mb": round(graph_rss / (1024 * 1024), 1),
+        "traversal_p50_ms": round(latencies[len(latencies) // 2] * 1000, 3),
+        "traversal_p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 3),
+        "avg_nodes_reached": round(reached / queries, 1)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark memory graph backends")
+    parser.add_argument('--nodes', type=int, default=200000, help='Number of memory nodes')
+    parser.add_argument('--edges', type=int, default=1000000, help='Number of relationships')
+    parser.add_argument('--queries', type=int, default=500, help='Traversals to time per backend')
+    parser.add_argument('--seed', type=int, default=42, help='Random seed')
+    parser.add_argument('--backends', nargs='*', default=['networkx', 'compact'], help='Backends to compare')
+    args = parser.parse_args()
+    
+    # Each backend runs in a fresh process so RSS deltas are not polluted
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for backend in args.backends:
+        with context.Pool(1) as pool:
+            results.append(pool.apply(run_backend, (backend, args.nodes, args.edges, args.queries, args.seed)))
+    
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
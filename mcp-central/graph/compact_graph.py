@@ -0,0 +1,373 @@
+#!/usr/bin/env python3
+"""
+Compact Graph Backend
+Array-backed directed graph with the subset of the NetworkX DiGraph API used by
+the memory graph service
+"""
+
+import math
+from array import array
+from collections.abc import Mapping
+from typing import Dict, List, Any, Iterable, Iterator, Tuple
+
+import numpy as np
+
+# Pending edge inserts merged into the CSR arrays once the buffer reaches
+# this size or this fraction of the compacted edge count, whichever is larger
+DELTA_MIN_COMPACT = 4096
+DELTA_COMPACT_RATIO = 0.1
+
+def _store_confidence(confidence) -> float:
+    """float32 slot value for an edge confidence; None is kept as NaN"""
+    return math.nan if confidence is None else confidence
+
+class _Interner:
+    """Maps strings to dense small integers and back"""
+    
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.values: List[str] = []
+    
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+class CompactDiGraph:
+    """Directed graph stored as CSR arrays plus an append-only delta buffer.
+    
+    Memory ids are interned to integers. Compacted edges live in ``indptr`` /
+    ``indices`` with confidence as float32 (NaN standing in for a ``None``
+    confidence) and relationship types as uint16 codes; new edges are
+    appended to a delta buffer and merged in bulk. Like a ``DiGraph`` there
+    is at most one edge per ordered pair, and re-adding an edge overwrites
+    its attributes.
+    
+    Node ``category`` is stored as a small-int code; any other node attributes
+    are kept in a sparse dict. Attribute dicts returned by ``nodes[n]`` and
+    ``graph[u][v]`` are built on access, so mutating them has no effect.
+    """
+    
+    def __init__(self):
+        self._ids: List[str] = []
+        self._index: Dict[str, int] = {}
+        self._categories = _Interner()
+        self._rel_types = _Interner()
+        self._node_category = array('H')
+        self._node_extra: Dict[int, Dict[str, Any]] = {}
+        
+        # Compacted CSR adjacency
+        self.indptr = np.zeros(1, dtype=np.int64)
+        self.indices = np.zeros(0, dtype=np.int32)
+        self.confidence = np.zeros(0, dtype=np.float32)
+        self.rel_type = np.zeros(0, dtype=np.uint16)
+        
+        # Append-only delta buffer
+        self._delta_src = array('i')
+        self._delta_dst = array('i')
+        self._delta_conf = array('f')
+        self._delta_type = array('H')
+        self._delta_pos: Dict[Tuple[int, int], int] = {}
+        self._delta_out: Dict[int, List[int]] = {}
+        
+        # Edge contexts are usually empty, so only non-empty ones are stored
+        self._contexts: Dict[Tuple[int, int], str] = {}
+    
+    # -- nodes ---------------------------------------------------------------
+    
+    def _intern_node(self, node_id: str) -> int:
+        idx = self._index.get(node_id)
+        if idx is None:
+            idx = len(self._ids)
+            self._index[node_id] = idx
+            self._ids.append(node_id)
+            self._node_category.append(self._categories.code('unknown'))
+        return idx
+    
+    def add_node(self, node_id: str, **attrs):
+        idx = self._intern_node(node_id)
+        category = attrs.pop('category', None)
+        if category is not None:
+            self._node_category[idx] = self._categories.code(category)
+        if attrs:
+            self._node_extra.setdefault(idx, {}).update(attrs)
+    
+    def add_nodes_from(self, nodes: Iterable):
+        for node in nodes:
+            if isinstance(node, tuple):
+                self.add_node(node[0], **node[1])
+            else:
+                self.add_node(node)
+    
+    def _node_attrs(self, idx: int) -> Dict[str, Any]:
+        attrs = {'category': self._categories.values[self._node_category[idx]]}
+        attrs.update(self._node_extra.get(idx, {}))
+        return attrs
+    
+    @property
+    def nodes(self) -> '_NodeView':
+        return _NodeView(self)
+    
+    def has_node(self, node_id: str) -> bool:
+        return node_id in self._index
+    
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._index
+    
+    def __len__(self) -> int:
+        return len(self._ids)
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+    
+    def number_of_nodes(self) -> int:
+        return len(self._ids)
+    
+    # -- edges ---------------------------------------------------------------
+    
+    def _csr_position(self, src: int, dst: int) -> int:
+        """Index of edge src->dst in the CSR arrays, or -1"""
+        if src + 1 >= len(self.indptr):
+            return -1
+        start, end = self.indptr[src], self.indptr[src + 1]
+        pos = start + np.searchsorted(self.indices[start:end], dst)
+        if pos < end and self.indices[pos] == dst:
+            return int(pos)
+        return -1
+    
+    def add_edge(self, source_id: str, target_id: str, **attrs):
+        src = self._intern_node(source_id)
+        dst = self._intern_node(target_id)
+        confidence = _store_confidence(attrs.get('confidence', 1.0))
+        type_code = self._rel_types.code(attrs.get('relationship_type') or 'related_to')
+        
+        context = attrs.get('context')
+        if context:
+            self._contexts[(src, dst)] = context
+        elif context is not None:
+            self._contexts.pop((src, dst), None)
+        
+        # Existing edges are updated in place rather than duplicated
+        pos = self._csr_position(src, dst)
+        if pos >= 0:
+            self.confidence[pos] = confidence
+            self.rel_type[pos] = type_code
+            return
+        
+        pos = self._delta_pos.get((src, dst))
+        if pos is not None:
+            self._delta_conf[pos] = confidence
+            self._delta_type[pos] = type_code
+            return
+        
+        pos = len(self._delta_src)
+        self._append_delta(src, dst, confidence, type_code)
+        self._delta_pos[(src, dst)] = pos
+        self._delta_out.setdefault(src, []).append(pos)
+        
+        if pos + 1 >= max(DELTA_MIN_COMPACT, DELTA_COMPACT_RATIO * len(self.indices)):
+            self.compact()
+    
+    def _append_delta(self, src: int, dst: int, confidence: float, type_code: int):
+        self._delta_src.append(src)
+        self._delta_dst.append(dst)
+        self._delta_conf.append(confidence)
+        self._delta_type.append(type_code)
+    
+    def add_edges_from(self, edges: Iterable):
+        """Append edges straight to the delta buffer and compact once.
+        
+        Skips the per-edge existence checks of ``add_edge``; duplicates are
+        resolved during compaction with the last occurrence winning.
+        """
+        self.compact()
+        for edge in edges:
+            attrs = edge[2] if len(edge) > 2 else {}
+            src = self._intern_node(edge[0])
+            dst = self._intern_node(edge[1])
+            
+            context = attrs.get('context')
+            if context:
+                self._contexts[(src, dst)] = context
+            elif context is not None:
+                self._contexts.pop((src, dst), None)
+            
+            self._append_delta(src, dst, _store_confidence(attrs.get('confidence', 1.0)),
+                               self._rel_types.code(attrs.get('relationship_type') or 'related_to'))
+        self.compact()
+    
+    def compact(self):
+        """Merge the delta buffer into the CSR arrays"""
+        node_count = len(self._ids)
+        if not self._delta_src and len(self.indptr) == node_count + 1:
+            return
+        
+        csr_src = np.repeat(np.arange(len(self.indptr) - 1, dtype=np.int32), np.diff(self.indptr))
+        src = np.concatenate([csr_src, np.frombuffer(self._delta_src, dtype=np.int32)])
+        dst = np.concatenate([self.indices, np.frombuffer(self._delta_dst, dtype=np.int32)])
+        conf = np.concatenate([self.confidence, np.frombuffer(self._delta_conf, dtype=np.float32)])
+        types = np.concatenate([self.rel_type, np.frombuffer(self._delta_type, dtype=np.uint16)])
+        
+        # Stable sort by (src, dst); for repeated pairs keep the last write
+        order = np.lexsort((dst, src))
+        src, dst = src[order], dst[order]
+        keep = np.ones(len(order), dtype=bool)
+        keep[:-1] = (src[1:] != src[:-1]) | (dst[1:] != dst[:-1])
+        
+        src = src[keep]
+        self.indices = dst[keep]
+        self.confidence = conf[order][keep]
+        self.rel_type = types[order][keep]
+        
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=node_count), out=self.indptr[1:])
+        
+        self._delta_src = array('i')
+        self._delta_dst = array('i')
+        self._delta_conf = array('f')
+        self._delta_type = array('H')
+        self._delta_pos.clear()
+        self._delta_out.clear()
+    
+    def _edge_attrs(self, src: int, dst: int, confidence, type_code) -> Dict[str, Any]:
+        confidence = float(confidence)
+        return {
+            'relationship_type': self._rel_types.values[type_code],
+            # float32 storage; round away the representation noise
+            'confidence': None if math.isnan(confidence) else round(confidence, 6),
+            'context': self._contexts.get((src, dst), '')
+        }
+    
+    def _out_edges(self, src: int) -> Iterator[Tuple[int, float, int]]:
+        """Yield (dst, confidence, type_code) for every edge leaving src"""
+        if src + 1 < len(self.indptr):
+            start, end = self.indptr[src], self.indptr[src + 1]
+            yield from zip(self.indices[start:end].tolist(),
+                           self.confidence[start:end].tolist(),
+                           self.rel_type[start:end].tolist())
+        for pos in self._delta_out.get(src, ()):
+            yield self._delta_dst[pos], self._delta_conf[pos], self._delta_type[pos]
+    
+    def _edge_lookup(self, src: int, dst: int):
+        pos = self._csr_position(src, dst)
+        if pos >= 0:
+            return self._edge_attrs(src, dst, self.confidence[pos], self.rel_type[pos])
+        pos = self._delta_pos.get((src, dst))
+        if pos is not None:
+            return self._edge_attrs(src, dst, self._delta_conf[pos], self._delta_type[pos])
+        return None
+    
+    def neighbors(self, node_id: str) -> Iterator[str]:
+        ids = self._ids
+        return (ids[dst] for dst, _, _ in self._out_edges(self._index[node_id]))
+    
+    successors = neighbors
+    
+    def __getitem__(self, node_id: str) -> '_AdjacencyView':
+        return _AdjacencyView(self, self._index[node_id])
+    
+    def has_edge(self, source_id: str, target_id: str) -> bool:
+        src, dst = self._index.get(source_id), self._index.get(target_id)
+        if src is None or dst is None:
+            return False
+        return self._edge_lookup(src, dst) is not None
+    
+    def edges(self, data: bool = False) -> '_EdgeView':
+        return _EdgeView(self, data)
+    
+    def number_of_edges(self) -> int:
+        return len(self.indices) + len(self._delta_src)
+    
+    def out_degree_array(self) -> np.ndarray:
+        """Out-degree per interned node index"""
+        self.compact()
+        return np.diff(self.indptr)
+    
+    # -- derived graphs ------------------------------------------------------
+    
+    def subgraph(self, node_ids: Iterable[str]) -> 'CompactDiGraph':
+        """Induced subgraph as a new (copied) CompactDiGraph"""
+        keep = [self._index[n] for n in dict.fromkeys(node_ids) if n in self._index]
+        keep_set = set(keep)
+        
+        sub = CompactDiGraph()
+        for idx in keep:
+            sub.add_node(self._ids[idx], **self._node_attrs(idx))
+        for src in keep:
+            for dst, confidence, type_code in self._out_edges(src):
+                if dst in keep_set:
+                    sub.add_edge(self._ids[src], self._ids[dst],
+                                 **self._edge_attrs(src, dst, confidence, type_code))
+        sub.compact()
+        return sub
+
+class _NodeView(Mapping):
+    """Read-only view over nodes, callable like ``DiGraph.nodes()``"""
+    
+    def __init__(self, graph: CompactDiGraph):
+        self._graph = graph
+    
+    def __call__(self, data: bool = False):
+        if data:
+            return ((node_id, self[node_id]) for node_id in self._graph._ids)
+        return self
+    
+    def __getitem__(self, node_id: str) -> Dict[str, Any]:
+        return self._graph._node_attrs(self._graph._index[node_id])
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._graph._ids)
+    
+    def __len__(self) -> int:
+        return len(self._graph._ids)
+    
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._graph._index
+
+class _AdjacencyView(Mapping):
+    """Outgoing edges of one node, mapping target id to edge attributes"""
+    
+    def __init__(self, graph: CompactDiGraph, src: int):
+        self._graph = graph
+        self._src = src
+    
+    def __getitem__(self, target_id: str) -> Dict[str, Any]:
+        dst = self._graph._index.get(target_id)
+        attrs = None if dst is None else self._graph._edge_lookup(self._src, dst)
+        if attrs is None:
+            raise KeyError(target_id)
+        return attrs
+    
+    def __iter__(self) -> Iterator[str]:
+        ids = self._graph._ids
+        return (ids[dst] for dst, _, _ in self._graph._out_edges(self._src))
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self._graph._out_edges(self._src))
+    
+    def items(self):
+        graph, src = self._graph, self._src
+        return ((graph._ids[dst], graph._edge_attrs(src, dst, confidence, type_code))
+                for dst, confidence, type_code in graph._out_edges(src))
+
+class _EdgeView:
+    """Iterable of (source, target) or (source, target, attrs) tuples"""
+    
+    def __init__(self, graph: CompactDiGraph, data: bool):
+        self._graph = graph
+        self._data = data
+    
+    def __iter__(self):
+        graph = self._graph
+        for src in range(len(graph._ids)):
+            for dst, confidence, type_code in graph._out_edges(src):
+                if self._data:
+                    yield graph._ids[src], graph._ids[dst], graph._edge_attrs(src, dst, confidence, type_code)
+                else:
+                    yield graph._ids[src], graph._ids[dst]
+    
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
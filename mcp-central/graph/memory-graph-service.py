@@ -4,24 +4,244 @@ Memory Relationship Graph Service
 Manages memory relationships and provides graph visualization
 """
 
+import argparse
+import asyncio
+import heapq
 import json
-import sqlite3
-from typing import Dict, List, Any, Optional
+import logging
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import count, islice
+from typing import Dict, List, Any, Optional, Iterable, Iterator
 import networkx as nx
 from datetime import datetime
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.sqlite_pool import SQLiteConnectionManager, read_snapshot
+from storage.migrations import apply_migrations
+
+try:
+    from graph.compact_graph import CompactDiGraph
+    COMPACT_BACKEND_AVAILABLE = True
+except ImportError:
+    COMPACT_BACKEND_AVAILABLE = False
+
+try:
+    import numpy as np
+    from graph import graph_analytics
+    ANALYTICS_AVAILABLE = True
+except ImportError:
+    ANALYTICS_AVAILABLE = False
+
+try:
+    from aiohttp import web
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = "/Users/josephhillin/workspace/mcp-central/graph/memory-graph.db"
+
+# HTTP API defaults; the orchestrator launches --api-mode --port 8767
+API_PORT = 8767
+API_KEEPALIVE_SECONDS = 75
+API_MAX_BODY_BYTES = 64 * 1024 * 1024
+EXPORT_CHUNK_BYTES = 64 * 1024
+LATENCY_BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Rows handed to executemany per round trip during bulk ingest
+BULK_BATCH_SIZE = 5000
+
+# Node payloads kept in memory when running in lazy mode
+PAYLOAD_CACHE_SIZE = 10000
+
+# find_related_memories results kept per distinct argument tuple
+RELATED_CACHE_SIZE = 1024
+
+# Output formats understood by export_graph_json
+EXPORT_FORMATS = ("json", "compact", "ndjson")
+
+# Background analytics refresh cadence
+ANALYTICS_INTERVAL_SECONDS = 300
+
+# Above this share of changed edges a refresh recomputes everything
+INCREMENTAL_REFRESH_RATIO = 0.05
+MAX_TRACKED_DIRTY_EDGES = 100000
+
+# SQLite's default limit on bound parameters per statement is 999
+SQL_IN_CHUNK_SIZE = 900
+
+# One row per (source, target, type); re-adding an edge refreshes it in place
+UPSERT_RELATIONSHIP_SQL = '''
+    INSERT INTO memory_relationships
+    (source_memory_id, target_memory_id, relationship_type, confidence, context, created_timestamp)
+    VALUES (?, ?, ?, ?, ?, ?)
+    ON CONFLICT (source_memory_id, target_memory_id, relationship_type)
+    DO UPDATE SET confidence = excluded.confidence, context = excluded.context
+'''
+
+class LRUCache:
+    """Thread-safe bounded mapping that evicts the least recently used key"""
+    
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+    
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def pop(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+    
+    def __len__(self):
+        return len(self._data)
+
 class MemoryGraphService:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool_size: int = 4, lazy: bool = False,
+                 payload_cache_size: int = PAYLOAD_CACHE_SIZE, backend: str = "networkx",
+                 related_cache_size: int = RELATED_CACHE_SIZE):
+        """Open the graph database and load the graph.
+        
+        With ``lazy=True`` only adjacency (node ids, categories and edges) is
+        loaded up front; content, tags and metadata are read from SQLite on
+        first access and kept in a bounded LRU cache.
+        
+        ``backend`` selects the in-memory graph: ``"networkx"`` (DiGraph) or
+        ``"compact"`` (CSR arrays, see graph/compact_graph.py).
+        
+        ``find_related_memories`` results are cached per argument tuple and
+        invalidated by ``graph_version``, which every write bumps.
+        
+        Precomputed node metrics (PageRank, component, community, degree
+        centrality) are loaded from ``memory_node_metrics`` and attached to
+        related-memory results; see ``refresh_graph_metrics``.
+        """
         self.db_path = db_path
-        self.graph = nx.DiGraph()
+        self.db = SQLiteConnectionManager(db_path, pool_size=pool_size)
+        self.lazy = lazy
+        self.payload_cache = LRUCache(payload_cache_size)
+        self.backend = backend
+        self.graph = self.create_graph(backend)
+        self.graph_version = 0
+        self.related_cache = LRUCache(related_cache_size)
+        
+        # memory_id -> (pagerank, component_id, community_id, degree_centrality)
+        self.node_metrics: Dict[str, tuple] = {}
+        self._dirty_lock = threading.Lock()
+        self._dirty_nodes = set()
+        self._dirty_edges = []
+        self._dirty_overflow = False
+        self._metrics_lock = threading.Lock()
+        self._analytics_stop = threading.Event()
+        self._analytics_thread = None
+        
         self.init_graph_db()
         self.load_graph()
+        self.load_node_metrics()
+    
+    @staticmethod
+    def create_graph(backend: str = "networkx"):
+        """Create an empty graph for the requested backend"""
+        if backend == "networkx":
+            return nx.DiGraph()
+        if backend == "compact":
+            if not COMPACT_BACKEND_AVAILABLE:
+                raise ImportError("The compact graph backend requires numpy")
+            return CompactDiGraph()
+        raise ValueError(f"Unknown graph backend: {backend}")
+    
+    def close(self):
+        """Stop background jobs and release pooled database connections"""
+        self.stop_analytics_job()
+        self.db.close()
     
     def init_graph_db(self):
-        """Initialize graph database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """Initialize graph database and bring its schema up to date"""
+        with self.db.writer() as conn:
+            self.schema_version = apply_migrations(conn, "memory_graph", [
+                (1, [self._create_graph_tables]),
+                (2, [
+                    # Collapse duplicate edges, keeping the most recent row
+                    '''
+                    DELETE FROM memory_relationships WHERE id NOT IN (
+                        SELECT MAX(id) FROM memory_relationships
+                        GROUP BY source_memory_id, target_memory_id, relationship_type
+                    )
+                    ''',
+                    '''
+                    CREATE UNIQUE INDEX IF NOT EXISTS idx_relationships_edge
+                    ON memory_relationships (source_memory_id, target_memory_id, relationship_type)
+                    ''',
+                    # Covering indexes for outgoing / incoming neighbor lookups
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_relationships_source
+                    ON memory_relationships (source_memory_id, confidence, target_memory_id, relationship_type)
+                    ''',
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_relationships_target
+                    ON memory_relationships (target_memory_id, confidence, source_memory_id, relationship_type)
+                    ''',
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_relationships_type
+                    ON memory_relationships (relationship_type)
+                    '''
+                ]),
+                (3, [
+                    '''
+                    CREATE TABLE IF NOT EXISTS memory_node_metrics (
+                        memory_id TEXT PRIMARY KEY,
+                        pagerank REAL,
+                        component_id INTEGER,
+                        community_id INTEGER,
+                        degree_centrality REAL,
+                        computed_timestamp TEXT
+                    )
+                    '''
+                ]),
+                (4, [
+                    # Which graph the stored metrics were computed from, so
+                    # changes made by other processes are noticed too
+                    '''
+                    CREATE TABLE IF NOT EXISTS memory_node_metrics_watermark (
+                        id INTEGER PRIMARY KEY CHECK (id = 1),
+                        max_relationship_id INTEGER,
+                        relationship_count INTEGER,
+                        node_count INTEGER,
+                        computed_timestamp TEXT
+                    )
+                    '''
+                ])
+            ])
+    
+    def _create_graph_tables(self, cursor):
+        """Create base graph tables"""
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS memory_nodes (
                 memory_id TEXT PRIMARY KEY,
@@ -46,67 +266,262 @@ class MemoryGraphService:
                 FOREIGN KEY (target_memory_id) REFERENCES memory_nodes (memory_id)
             )
         ''')
-        
-        conn.commit()
-        conn.close()
     
     def add_memory_node(self, memory_id: str, content: str, category: str, 
                        tags: List[str], metadata: Dict = None):
         """Add memory node to graph"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO memory_nodes 
-            (memory_id, content, category, tags, created_timestamp, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            memory_id, content, category, 
-            json.dumps(tags), 
-            datetime.now().isoformat(),
-            json.dumps(metadata or {})
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.db.writer() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO memory_nodes 
+                (memory_id, content, category, tags, created_timestamp, metadata)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                memory_id, content, category, 
+                json.dumps(tags), 
+                datetime.now().isoformat(),
+                json.dumps(metadata or {})
+            ))
         
         # Add to NetworkX graph
-        self.graph.add_node(memory_id, 
-                           content=content,
-                           category=category,
-                           tags=tags,
-                           metadata=metadata or {})
+        if self.lazy:
+            self.graph.add_node(memory_id, category=category)
+            self.payload_cache.pop(memory_id)
+        else:
+            self.graph.add_node(memory_id, 
+                               content=content,
+                               category=category,
+                               tags=tags,
+                               metadata=metadata or {})
+        
+        # Bump after mutating so no result computed on the old graph gets the new version
+        self.graph_version += 1
+        self._mark_dirty(nodes=[memory_id])
     
     def add_relationship(self, source_id: str, target_id: str, 
                         relationship_type: str, confidence: float = 1.0,
                         context: str = ""):
         """Add relationship between memories"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO memory_relationships 
-            (source_memory_id, target_memory_id, relationship_type, confidence, context, created_timestamp)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (source_id, target_id, relationship_type, confidence, context, datetime.now().isoformat()))
-        
-        conn.commit()
-        conn.close()
+        with self.db.writer() as conn:
+            conn.execute(UPSERT_RELATIONSHIP_SQL, (
+                source_id, target_id, relationship_type, confidence, context, datetime.now().isoformat()
+            ))
         
         # Add to NetworkX graph
         self.graph.add_edge(source_id, target_id,
                            relationship_type=relationship_type,
                            confidence=confidence,
                            context=context)
+        self.graph_version += 1
+        self._mark_dirty(edges=[(source_id, target_id)])
+    
+    def add_memory_nodes_bulk(self, nodes: Iterable, batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Add many memory nodes in a single transaction.
+        
+        Each item is either a dict of ``add_memory_node`` keyword arguments or a
+        ``(memory_id, content, category, tags[, metadata])`` tuple. Input is
+        consumed in batches, so generators of any length are fine.
+        """
+        now = datetime.now().isoformat()
+        graph_nodes = []
+        
+        with self.db.writer() as conn:
+            for batch in self._batched(nodes, batch_size):
+                rows = []
+                for item in batch:
+                    if isinstance(item, dict):
+                        memory_id, content, category = item['memory_id'], item['content'], item['category']
+                        tags, metadata = item.get('tags') or [], item.get('metadata') or {}
+                    else:
+                        memory_id, content, category, tags = item[:4]
+                        metadata = item[4] if len(item) > 4 and item[4] else {}
+                        tags = tags or []
+                    
+                    rows.append((memory_id, content, category, json.dumps(tags), now, json.dumps(metadata)))
+                    if self.lazy:
+                        graph_nodes.append((memory_id, {'category': category}))
+                        self.payload_cache.pop(memory_id)
+                    else:
+                        graph_nodes.append((memory_id, {
+                            'content': content,
+                            'category': category,
+                            'tags': tags,
+                            'metadata': metadata
+                        }))
+                
+                conn.executemany('''
+                    INSERT OR REPLACE INTO memory_nodes
+                    (memory_id, content, category, tags, created_timestamp, metadata)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', rows)
+        
+        # Only touch the in-memory graph once the transaction has committed
+        self.graph.add_nodes_from(graph_nodes)
+        self.graph_version += 1
+        self._mark_dirty(nodes=[memory_id for memory_id, _ in graph_nodes])
+        return len(graph_nodes)
+    
+    def add_relationships_bulk(self, relationships: Iterable,
+                               batch_size: int = BULK_BATCH_SIZE) -> int:
+        """Add many relationships in a single transaction.
+        
+        Each item is either a dict of ``add_relationship`` keyword arguments or a
+        ``(source_id, target_id, relationship_type[, confidence[, context]])`` tuple.
+        """
+        now = datetime.now().isoformat()
+        graph_edges = []
+        
+        with self.db.writer() as conn:
+            for batch in self._batched(relationships, batch_size):
+                rows = []
+                for item in batch:
+                    if isinstance(item, dict):
+                        source_id, target_id = item['source_id'], item['target_id']
+                        relationship_type = item['relationship_type']
+                        confidence = item.get('confidence', 1.0)
+                        context = item.get('context', "")
+                    else:
+                        source_id, target_id, relationship_type = item[:3]
+                        confidence = item[3] if len(item) > 3 else 1.0
+                        context = item[4] if len(item) > 4 else ""
+                    
+                    rows.append((source_id, target_id, relationship_type, confidence, context, now))
+                    graph_edges.append((source_id, target_id, {
+                        'relationship_type': relationship_type,
+                        'confidence': confidence,
+                        'context': context
+                    }))
+                
+                conn.executemany(UPSERT_RELATIONSHIP_SQL, rows)
+        
+        self.graph.add_edges_from(graph_edges)
+        self.graph_version += 1
+        self._mark_dirty(edges=[(source_id, target_id) for source_id, target_id, _ in graph_edges])
+        return len(graph_edges)
+    
+    @staticmethod
+    def _batched(items: Iterable, batch_size: int) -> Iterator[List]:
+        """Yield lists of up to batch_size items from any iterable"""
+        iterator = iter(items)
+        while True:
+            batch = list(islice(iterator, batch_size))
+            if not batch:
+                return
+            yield batch
+    
+    def get_relationships(self, memory_id: str, direction: str = "outgoing",
+                          min_confidence: float = 0.0) -> List[Dict]:
+        """Look up a memory's edges directly in SQLite via the covering indexes"""
+        if direction == "outgoing":
+            key_column, other_column = "source_memory_id", "target_memory_id"
+        elif direction == "incoming":
+            key_column, other_column = "target_memory_id", "source_memory_id"
+        else:
+            raise ValueError(f"Unknown direction: {direction}")
+        
+        with self.db.reader() as conn:
+            rows = conn.execute(f'''
+                SELECT {other_column}, relationship_type, confidence
+                FROM memory_relationships
+                WHERE {key_column} = ? AND confidence >= ?
+                ORDER BY confidence DESC
+            ''', (memory_id, min_confidence)).fetchall()
+        
+        return [
+            {'memory_id': other_id, 'relationship_type': rel_type, 'confidence': confidence}
+            for other_id, rel_type, confidence in rows
+        ]
+    
+    def get_node_data(self, memory_id: str) -> Dict:
+        """Return a node's attributes, fetching its payload from SQLite if lazy"""
+        if not self.lazy:
+            return self.graph.nodes[memory_id] if memory_id in self.graph else {}
+        
+        return self.get_nodes_data([memory_id]).get(memory_id, {})
+    
+    def get_nodes_data(self, memory_ids: Iterable[str]) -> Dict[str, Dict]:
+        """Return attributes for many nodes, batching SQLite reads for cache misses"""
+        if not self.lazy:
+            return {m: self.graph.nodes[m] for m in memory_ids if m in self.graph}
+        
+        found = {}
+        missing = []
+        for memory_id in memory_ids:
+            payload = self.payload_cache.get(memory_id)
+            if payload is None:
+                missing.append(memory_id)
+            else:
+                found[memory_id] = payload
+        
+        if missing:
+            with self.db.reader() as conn:
+                for batch in self._batched(missing, SQL_IN_CHUNK_SIZE):
+                    placeholders = ','.join('?' * len(batch))
+                    rows = conn.execute(f'''
+                        SELECT memory_id, content, category, tags, created_timestamp, metadata
+                        FROM memory_nodes WHERE memory_id IN ({placeholders})
+                    ''', batch)
+                    for row in rows:
+                        payload = self._decode_node_row(row)
+                        self.payload_cache.put(row[0], payload)
+                        found[row[0]] = payload
+        
+        return found
+    
+    def search_nodes(self, query: str, category: str = None) -> List[Dict]:
+        """Case-insensitive substring search over node content in SQLite"""
+        sql = '''
+            SELECT memory_id, content, category, tags, created_timestamp, metadata
+            FROM memory_nodes WHERE instr(lower(content), ?) > 0
+        '''
+        params = [query.lower()]
+        if category:
+            sql += ' AND category = ?'
+            params.append(category)
+        
+        with self.db.reader() as conn:
+            rows = conn.execute(sql, params).fetchall()
+        
+        return [dict(self._decode_node_row(row), memory_id=row[0]) for row in rows]
+    
+    @staticmethod
+    def _decode_node_row(row) -> Dict:
+        """Turn a memory_nodes row into a node attribute dict"""
+        _, content, category, tags, created_timestamp, metadata = row
+        return {
+            'content': content,
+            'category': category,
+            'tags': json.loads(tags) if tags else [],
+            'created_timestamp': created_timestamp,
+            'metadata': json.loads(metadata) if metadata else {}
+        }
     
     def load_graph(self):
         """Load graph from database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self.db.reader() as conn:
+            if self.lazy:
+                self._load_adjacency_rows(conn.cursor())
+            else:
+                self._load_graph_rows(conn.cursor())
+    
+    def _load_adjacency_rows(self, cursor):
+        """Populate node ids, categories and edges without node payloads"""
+        cursor.execute('SELECT memory_id, category FROM memory_nodes')
+        self.graph.add_nodes_from((memory_id, {'category': category}) for memory_id, category in cursor)
         
+        cursor.execute('''
+            SELECT source_memory_id, target_memory_id, relationship_type, confidence, context
+            FROM memory_relationships
+        ''')
+        self.graph.add_edges_from(
+            (source_id, target_id, {'relationship_type': rel_type, 'confidence': confidence, 'context': context})
+            for source_id, target_id, rel_type, confidence, context in cursor
+        )
+    
+    def _load_graph_rows(self, cursor):
+        """Populate the NetworkX graph from node and edge rows"""
         # Load nodes
         cursor.execute('SELECT * FROM memory_nodes')
-        for row in cursor.fetchall():
+        for row in cursor:
             memory_id, content, category, tags, created_timestamp, metadata = row
             self.graph.add_node(memory_id,
                                content=content,
@@ -117,87 +532,437 @@ class MemoryGraphService:
         
         # Load edges
         cursor.execute('SELECT * FROM memory_relationships')
-        for row in cursor.fetchall():
+        for row in cursor:
             _, source_id, target_id, rel_type, confidence, context, created_timestamp = row
             self.graph.add_edge(source_id, target_id,
                                relationship_type=rel_type,
                                confidence=confidence,
                                context=context,
                                created_timestamp=created_timestamp)
-        
-        conn.close()
     
     def find_related_memories(self, memory_id: str, max_depth: int = 2, 
-                             min_confidence: float = 0.5) -> Dict:
-        """Find memories related to given memory"""
+                             min_confidence: float = 0.5, max_results: int = None,
+                             fan_out: int = None, best_first: bool = False) -> Dict:
+        """Find memories related to given memory
+        
+        Each related memory is reported once, at the first (shallowest, or with
+        ``best_first`` the most confident) path that reaches it within
+        ``max_depth`` hops. ``fan_out`` caps how many of a node's strongest
+        qualifying edges are followed, and ``max_results`` stops the traversal
+        once that many memories have been found. ``path_confidence`` is the
+        product of edge confidences along the path.
+        
+        Results may be served from a shared cache; treat them as read-only.
+        """
         if memory_id not in self.graph:
             return {'related': [], 'graph_data': None}
         
-        # BFS to find related nodes
+        cache_key = (memory_id, max_depth, min_confidence, max_results, fan_out,
+                     best_first, self.graph_version)
+        cached = self.related_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        if best_first:
+            related_nodes = self._best_first_traversal(memory_id, max_depth, min_confidence,
+                                                       max_results, fan_out)
+        else:
+            related_nodes = self._bfs_traversal(memory_id, max_depth, min_confidence,
+                                                max_results, fan_out)
+        
+        # Generate subgraph for visualization
+        subgraph_nodes = [memory_id] + [r['memory_id'] for r in related_nodes]
+        subgraph = self.graph.subgraph(subgraph_nodes)
+        
+        result = {
+            'related': related_nodes,
+            'graph_data': self.networkx_to_d3(subgraph)
+        }
+        self.related_cache.put(cache_key, result)
+        return result
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the related-memory and node payload caches"""
+        return {
+            'graph_version': self.graph_version,
+            'related': {
+                'hits': self.related_cache.hits,
+                'misses': self.related_cache.misses,
+                'size': len(self.related_cache),
+                'max_size': self.related_cache.max_size
+            },
+            'payload': {
+                'hits': self.payload_cache.hits,
+                'misses': self.payload_cache.misses,
+                'size': len(self.payload_cache),
+                'max_size': self.payload_cache.max_size
+            }
+        }
+    
+    def _mark_dirty(self, nodes: Iterable[str] = (), edges: Iterable[tuple] = ()):
+        """Record graph changes for the next incremental metrics refresh"""
+        with self._dirty_lock:
+            self._dirty_nodes.update(nodes)
+            if self._dirty_overflow:
+                return
+            self._dirty_edges.extend(edges)
+            if len(self._dirty_edges) > MAX_TRACKED_DIRTY_EDGES:
+                # Too many changes to be worth tracking; refresh everything next time
+                self._dirty_edges = []
+                self._dirty_overflow = True
+    
+    def load_node_metrics(self):
+        """Load precomputed node metrics from the database"""
+        with self.db.reader() as conn:
+            self.node_metrics = self._read_node_metrics(conn)
+    
+    @staticmethod
+    def _read_node_metrics(conn) -> Dict[str, tuple]:
+        rows = conn.execute('''
+            SELECT memory_id, pagerank, component_id, community_id, degree_centrality
+            FROM memory_node_metrics
+        ''').fetchall()
+        return {row[0]: tuple(row[1:]) for row in rows}
+    
+    @staticmethod
+    def _graph_watermark(conn) -> tuple:
+        """``(max_relationship_id, relationship_count, node_count)`` of the stored graph"""
+        return tuple(conn.execute('''
+            SELECT (SELECT COALESCE(MAX(id), 0) FROM memory_relationships),
+                   (SELECT COUNT(*) FROM memory_relationships),
+                   (SELECT COUNT(*) FROM memory_nodes)
+        ''').fetchone())
+    
+    @staticmethod
+    def _metrics_watermark(conn) -> Optional[tuple]:
+        """Graph watermark the stored metrics were computed from, if any"""
+        row = conn.execute('''
+            SELECT max_relationship_id, relationship_count, node_count
+            FROM memory_node_metrics_watermark WHERE id = 1
+        ''').fetchone()
+        return tuple(row) if row else None
+    
+    def metrics_stale(self) -> bool:
+        """Whether nodes or relationships changed since metrics were last stored,
+        whichever process wrote them"""
+        with self.db.reader() as conn:
+            with read_snapshot(conn):
+                return self._metrics_watermark(conn) != self._graph_watermark(conn)
+    
+    def refresh_graph_metrics(self, full: bool = False) -> Dict[str, Any]:
+        """Recompute PageRank, components, communities and degree centrality.
+        
+        Small change sets are refreshed incrementally: PageRank is warm-started
+        from the previous scores, components are merged over the new edges and
+        label propagation only revisits the touched nodes. Only rows whose
+        metrics changed are written back.
+        
+        New edges are found by relationship id past the watermark saved with
+        the metrics, so edges written by other processes or before a restart
+        are included. Without a watermark, or when relationships were deleted
+        since, the refresh is full.
+        """
+        if not ANALYTICS_AVAILABLE:
+            return {"success": False, "error": "Graph analytics requires numpy"}
+        
+        if not self._metrics_lock.acquire(blocking=False):
+            return {"success": False, "error": "Metrics refresh already running"}
+        
+        try:
+            with self._dirty_lock:
+                dirty_nodes, self._dirty_nodes = self._dirty_nodes, set()
+                dirty_edges, self._dirty_edges = self._dirty_edges, []
+                overflow, self._dirty_overflow = self._dirty_overflow, False
+            
+            try:
+                return self._refresh_graph_metrics(full, dirty_nodes, dirty_edges, overflow)
+            except Exception:
+                # Lost track of what changed, so the next run must start over
+                with self._dirty_lock:
+                    self._dirty_overflow = True
+                raise
+        finally:
+            self._metrics_lock.release()
+    
+    def _refresh_graph_metrics(self, full: bool, dirty_nodes: set, dirty_edges: List[tuple],
+                               overflow: bool) -> Dict[str, Any]:
+        start_time = time.perf_counter()
+        
+        with self.db.reader() as conn:
+            with read_snapshot(conn):
+                node_ids, index, src, dst, weight = graph_analytics.load_edge_arrays(conn)
+                watermark = self._graph_watermark(conn)
+                stored_watermark = self._metrics_watermark(conn)
+                previous = self._read_node_metrics(conn)
+                new_edges = []
+                if stored_watermark is not None:
+                    new_edges = conn.execute('''
+                        SELECT source_memory_id, target_memory_id FROM memory_relationships WHERE id > ?
+                    ''', (stored_watermark[0],)).fetchall()
+        
+        n = len(node_ids)
+        # Edge updates keep their id; deleted or replaced rows show up as a lower count
+        changed_edges = dirty_edges + [tuple(edge) for edge in new_edges]
+        incremental = (not full and not overflow and bool(previous)
+                       and stored_watermark is not None
+                       and watermark[1] - len(new_edges) == stored_watermark[1]
+                       and len(changed_edges) <= INCREMENTAL_REFRESH_RATIO * max(len(src), 1))
+        
+        if not incremental:
+            scores, iterations = graph_analytics.pagerank(n, src, dst, weight)
+            components = graph_analytics.connected_components(n, src, dst).tolist()
+            communities = graph_analytics.label_propagation(n, src, dst, weight)
+        else:
+            # New nodes start from the uniform score and get fresh labels
+            initial = np.array([
+                previous[memory_id][0] if memory_id in previous and previous[memory_id][0] else 1.0 / n
+                for memory_id in node_ids
+            ])
+            scores, iterations = graph_analytics.pagerank(n, src, dst, weight, initial=initial)
+            
+            next_label = max(max(max(m[1], m[2]) for m in previous.values()) + 1, n)
+            components, communities = [], []
+            for i, memory_id in enumerate(node_ids):
+                if memory_id in previous:
+                    components.append(previous[memory_id][1])
+                    communities.append(previous[memory_id][2])
+                else:
+                    components.append(next_label + i)
+                    communities.append(next_label + i)
+            
+            changed_edges = [(index[s], index[t]) for s, t in changed_edges if s in index and t in index]
+            components = graph_analytics.merge_components(
+                np.array(components, dtype=np.int64), changed_edges
+            ).tolist()
+            
+            active = {index[memory_id] for memory_id in dirty_nodes if memory_id in index}
+            active.update(i for edge in changed_edges for i in edge)
+            active.update(i for i, memory_id in enumerate(node_ids) if memory_id not in previous)
+            communities = graph_analytics.label_propagation(n, src, dst, weight,
+                                                            labels=communities, active=active)
+        
+        centrality = graph_analytics.degree_centrality(n, src, dst)
+        
+        metrics = {}
+        for i, memory_id in enumerate(node_ids):
+            metrics[memory_id] = (round(float(scores[i]), 8), int(components[i]),
+                                  int(communities[i]), round(float(centrality[i]), 8))
+        
+        changed = [(memory_id, *values) for memory_id, values in metrics.items()
+                   if previous.get(memory_id) != values]
+        
+        computed_timestamp = datetime.now().isoformat()
+        with self.db.writer() as conn:
+            conn.executemany('''
+                INSERT OR REPLACE INTO memory_node_metrics
+                (memory_id, pagerank, component_id, community_id, degree_centrality, computed_timestamp)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', [row + (computed_timestamp,) for row in changed])
+            conn.execute('''
+                INSERT OR REPLACE INTO memory_node_metrics_watermark
+                (id, max_relationship_id, relationship_count, node_count, computed_timestamp)
+                VALUES (1, ?, ?, ?, ?)
+            ''', watermark + (computed_timestamp,))
+        
+        self.node_metrics = metrics
+        self.graph_version += 1
+        
+        return {
+            "success": True,
+            "mode": "incremental" if incremental else "full",
+            "nodes": n,
+            "edges": len(src),
+            "pagerank_iterations": iterations,
+            "rows_written": len(changed),
+            "duration_seconds": round(time.perf_counter() - start_time, 3)
+        }
+    
+    def start_analytics_job(self, interval_seconds: float = ANALYTICS_INTERVAL_SECONDS):
+        """Refresh graph metrics periodically on a background thread.
+        
+        A refresh runs when this process has unrefreshed changes or the
+        database has moved past the stored metrics watermark.
+        """
+        if self._analytics_thread is not None and self._analytics_thread.is_alive():
+            return
+        
+        self._analytics_stop.clear()
+        
+        def run():
+            while not self._analytics_stop.wait(interval_seconds):
+                with self._dirty_lock:
+                    pending = self._dirty_nodes or self._dirty_edges or self._dirty_overflow
+                try:
+                    if not pending and not self.metrics_stale():
+                        continue
+                    result = self.refresh_graph_metrics()
+                    logger.info("Graph metrics refresh: %s", result)
+                except Exception:
+                    logger.exception("Graph metrics refresh failed")
+        
+        self._analytics_thread = threading.Thread(target=run, name="graph-analytics", daemon=True)
+        self._analytics_thread.start()
+    
+    def stop_analytics_job(self):
+        """Stop the background metrics refresh and wait for it to finish"""
+        self._analytics_stop.set()
+        if self._analytics_thread is not None:
+            self._analytics_thread.join()
+            self._analytics_thread = None
+    
+    def _expand(self, current_id: str, visited, min_confidence: float, fan_out: int) -> List:
+        """Unvisited neighbors over edges meeting min_confidence, strongest first if capped"""
+        candidates = [
+            (neighbor, edge_data)
+            for neighbor, edge_data in self.graph[current_id].items()
+            if neighbor not in visited and edge_data.get('confidence', 1.0) >= min_confidence
+        ]
+        
+        if fan_out is not None and len(candidates) > fan_out:
+            candidates = heapq.nlargest(fan_out, candidates,
+                                        key=lambda c: c[1].get('confidence', 1.0))
+        
+        return candidates
+    
+    def _related_entry(self, neighbor: str, edge_data: Dict, depth: int, path_confidence: float) -> Dict:
+        pagerank, component_id, community_id, degree_centrality = self.node_metrics.get(
+            neighbor, (None, None, None, None)
+        )
+        return {
+            'memory_id': neighbor,
+            'relationship_type': edge_data.get('relationship_type'),
+            'confidence': edge_data.get('confidence', 1.0),
+            'depth': depth,
+            'context': edge_data.get('context', ''),
+            'path_confidence': path_confidence,
+            'pagerank': pagerank,
+            'component_id': component_id,
+            'community_id': community_id,
+            'degree_centrality': degree_centrality
+        }
+    
+    def _bfs_traversal(self, memory_id: str, max_depth: int, min_confidence: float,
+                       max_results: int, fan_out: int) -> List[Dict]:
+        """Breadth-first traversal, visiting each memory once"""
         related_nodes = []
-        visited = set()
-        queue = [(memory_id, 0)]
+        visited = {memory_id}
+        queue = deque([(memory_id, 0, 1.0)])
         
         while queue:
-            current_id, depth = queue.pop(0)
+            current_id, depth, path_confidence = queue.popleft()
             
-            if current_id in visited or depth > max_depth:
+            if depth >= max_depth:
                 continue
             
+            for neighbor, edge_data in self._expand(current_id, visited, min_confidence, fan_out):
+                visited.add(neighbor)
+                neighbor_confidence = path_confidence * edge_data.get('confidence', 1.0)
+                related_nodes.append(self._related_entry(neighbor, edge_data, depth + 1, neighbor_confidence))
+                
+                if max_results is not None and len(related_nodes) >= max_results:
+                    return related_nodes
+                
+                queue.append((neighbor, depth + 1, neighbor_confidence))
+        
+        return related_nodes
+    
+    def _best_first_traversal(self, memory_id: str, max_depth: int, min_confidence: float,
+                              max_results: int, fan_out: int) -> List[Dict]:
+        """Expand the highest cumulative-confidence path first"""
+        related_nodes = []
+        visited = set()
+        sequence = count()  # tie-breaker so the heap never compares dicts
+        heap = [(-1.0, next(sequence), memory_id, 0, None)]
+        
+        while heap:
+            negative_confidence, _, current_id, depth, edge_data = heapq.heappop(heap)
+            
+            if current_id in visited:
+                continue
             visited.add(current_id)
             
-            # Get neighbors
-            for neighbor in self.graph.neighbors(current_id):
-                edge_data = self.graph[current_id][neighbor]
-                confidence = edge_data.get('confidence', 1.0)
+            path_confidence = -negative_confidence
+            if edge_data is not None:
+                related_nodes.append(self._related_entry(current_id, edge_data, depth, path_confidence))
                 
-                if confidence >= min_confidence:
-                    related_nodes.append({
-                        'memory_id': neighbor,
-                        'relationship_type': edge_data.get('relationship_type'),
-                        'confidence': confidence,
-                        'depth': depth + 1,
-                        'context': edge_data.get('context', '')
-                    })
-                    
-                    if depth + 1 <= max_depth:
-                        queue.append((neighbor, depth + 1))
-        
-        # Generate subgraph for visualization
-        subgraph_nodes = [memory_id] + [r['memory_id'] for r in related_nodes]
-        subgraph = self.graph.subgraph(subgraph_nodes)
+                if max_results is not None and len(related_nodes) >= max_results:
+                    break
+            
+            if depth >= max_depth:
+                continue
+            
+            for neighbor, neighbor_edge in self._expand(current_id, visited, min_confidence, fan_out):
+                neighbor_confidence = path_confidence * neighbor_edge.get('confidence', 1.0)
+                heapq.heappush(heap, (-neighbor_confidence, next(sequence), neighbor, depth + 1, neighbor_edge))
         
-        return {
-            'related': related_nodes,
-            'graph_data': self.networkx_to_d3(subgraph)
-        }
+        return related_nodes
     
     def networkx_to_d3(self, graph) -> Dict:
         """Convert NetworkX graph to D3.js format"""
-        nodes = []
-        links = []
-        
-        for node_id in graph.nodes():
-            node_data = graph.nodes[node_id]
-            nodes.append({
-                'id': node_id,
-                'category': node_data.get('category', 'unknown'),
-                'content': node_data.get('content', '')[:100] + '...',
-                'tags': node_data.get('tags', []),
-                'group': self.get_category_group(node_data.get('category', 'unknown'))
-            })
+        return {
+            'nodes': list(self.iter_d3_nodes(graph)),
+            'links': list(self.iter_d3_links(graph))
+        }
+    
+    def _d3_node(self, node_id: str, node_data: Dict) -> Dict:
+        category = node_data.get('category') or 'unknown'
+        return {
+            'id': node_id,
+            'category': category,
+            'content': (node_data.get('content') or '')[:100] + '...',
+            'tags': node_data.get('tags', []),
+            'group': self.get_category_group(category)
+        }
+    
+    @staticmethod
+    def _d3_link(source: str, target: str, edge_data: Dict) -> Dict:
+        return {
+            'source': source,
+            'target': target,
+            'relationship_type': edge_data.get('relationship_type') or 'related_to',
+            'confidence': edge_data.get('confidence', 1.0),
+            'context': edge_data.get('context') or ''
+        }
+    
+    def iter_d3_nodes(self, graph) -> Iterator[Dict]:
+        """Yield D3 node dicts for a graph, fetching lazy payloads in chunks"""
+        if not self.lazy:
+            for node_id, node_data in graph.nodes(data=True):
+                yield self._d3_node(node_id, node_data)
+            return
         
-        for source, target in graph.edges():
-            edge_data = graph[source][target]
-            links.append({
-                'source': source,
-                'target': target,
-                'relationship_type': edge_data.get('relationship_type', 'related_to'),
-                'confidence': edge_data.get('confidence', 1.0),
-                'context': edge_data.get('context', '')
+        for batch in self._batched(graph.nodes(), SQL_IN_CHUNK_SIZE):
+            nodes_data = self.get_nodes_data(batch)
+            for node_id in batch:
+                yield self._d3_node(node_id, nodes_data.get(node_id, {}))
+    
+    def iter_d3_links(self, graph) -> Iterator[Dict]:
+        """Yield D3 link dicts for a graph"""
+        for source, target, edge_data in graph.edges(data=True):
+            yield self._d3_link(source, target, edge_data)
+    
+    def iter_d3_nodes_from_db(self, conn) -> Iterator[Dict]:
+        """Yield D3 node dicts straight from a SQLite cursor"""
+        rows = conn.execute('SELECT memory_id, content, category, tags FROM memory_nodes')
+        for memory_id, content, category, tags in rows:
+            yield self._d3_node(memory_id, {
+                'content': content,
+                'category': category,
+                'tags': json.loads(tags) if tags else []
+            })
+    
+    def iter_d3_links_from_db(self, conn) -> Iterator[Dict]:
+        """Yield D3 link dicts straight from a SQLite cursor"""
+        rows = conn.execute('''
+            SELECT source_memory_id, target_memory_id, relationship_type, confidence, context
+            FROM memory_relationships
+        ''')
+        for source, target, rel_type, confidence, context in rows:
+            yield self._d3_link(source, target, {
+                'relationship_type': rel_type,
+                'confidence': confidence,
+                'context': context
             })
-        
-        return {'nodes': nodes, 'links': links}
     
     def get_category_group(self, category: str) -> int:
         """Map memory categories to visualization groups"""
@@ -211,15 +976,372 @@ class MemoryGraphService:
         }
         return category_groups.get(category, 0)
     
-    def export_graph_json(self, file_path: str):
-        """Export entire graph as JSON for external visualization"""
-        graph_data = self.networkx_to_d3(self.graph)
+    def export_graph_json(self, file_path: str, export_format: str = "json",
+                          from_db: bool = None) -> Dict[str, Any]:
+        """Export entire graph as JSON for external visualization
+        
+        Nodes and links are written as they are generated, so peak memory does
+        not grow with graph size. Formats:
+        
+        - ``json``: D3 ``{"nodes": [...], "links": [...]}``, one item per line
+        - ``compact``: the same document without whitespace
+        - ``ndjson``: one JSON object per line, tagged ``"kind": "node"|"link"``
+        
+        ``from_db`` reads rows directly from SQLite cursors instead of the
+        in-memory graph; it defaults to True in lazy mode.
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unknown export format: {export_format}")
+        if from_db is None:
+            from_db = self.lazy
+        
         with open(file_path, 'w') as f:
-            json.dump(graph_data, f, indent=2)
+            if from_db:
+                # One read transaction keeps nodes and links on the same WAL snapshot;
+                # a dedicated connection so a long export does not hold a pooled reader
+                with self.db.dedicated_reader() as conn, read_snapshot(conn):
+                    counts = self._write_d3_stream(
+                        f, self.iter_d3_nodes_from_db(conn), self.iter_d3_links_from_db(conn), export_format
+                    )
+            else:
+                counts = self._write_d3_stream(
+                    f, self.iter_d3_nodes(self.graph), self.iter_d3_links(self.graph), export_format
+                )
+        
+        return dict(counts, export_path=file_path, format=export_format)
+    
+    @staticmethod
+    def _write_d3_stream(f, nodes: Iterable[Dict], links: Iterable[Dict],
+                         export_format: str) -> Dict[str, int]:
+        """Serialize node and link iterables to an open file one item at a time"""
+        counts = {'node_count': 0, 'edge_count': 0}
+        for chunk in MemoryGraphService.iter_d3_chunks(nodes, links, export_format, counts):
+            f.write(chunk)
+        return counts
+    
+    @staticmethod
+    def iter_d3_chunks(nodes: Iterable[Dict], links: Iterable[Dict], export_format: str,
+                       counts: Dict[str, int] = None) -> Iterator[str]:
+        """Yield the serialized export piece by piece, tallying items into ``counts``"""
+        if counts is None:
+            counts = {}
+        counts['node_count'] = counts['edge_count'] = 0
+        
+        if export_format == "ndjson":
+            for node in nodes:
+                yield json.dumps(dict(node, kind='node'), separators=(',', ':')) + '\n'
+                counts['node_count'] += 1
+            for link in links:
+                yield json.dumps(dict(link, kind='link'), separators=(',', ':')) + '\n'
+                counts['edge_count'] += 1
+            return
+        
+        if export_format == "compact":
+            separators, first_sep, item_sep, close_list = (',', ':'), '', ',', ']'
+        else:
+            separators, first_sep, item_sep, close_list = None, '\n    ', ',\n    ', '\n  ]'
+        
+        def list_chunks(items, key):
+            yield '['
+            for item in items:
+                yield item_sep if counts[key] else first_sep
+                yield json.dumps(item, separators=separators)
+                counts[key] += 1
+            yield close_list if counts[key] else ']'
+        
+        yield '{"nodes":' if export_format == "compact" else '{\n  "nodes": '
+        yield from list_chunks(nodes, 'node_count')
+        yield ',"links":' if export_format == "compact" else ',\n  "links": '
+        yield from list_chunks(links, 'edge_count')
+        yield '}' if export_format == "compact" else '\n}\n'
 
-if __name__ == "__main__":
-    graph_service = MemoryGraphService("/Users/josephhillin/workspace/mcp-central/graph/memory-graph.db")
+class LatencyHistogram:
+    """Fixed-bucket request latency histogram"""
+    
+    def __init__(self, bounds_ms: Iterable[float] = LATENCY_BUCKETS_MS):
+        self.bounds_ms = list(bounds_ms)
+        self.counts = [0] * (len(self.bounds_ms) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+    
+    def observe(self, elapsed_ms: float):
+        self.counts[bisect_left(self.bounds_ms, elapsed_ms)] += 1
+        self.count += 1
+        self.sum_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+    
+    def quantile(self, q: float) -> Optional[float]:
+        """Upper bucket bound containing the q-th observation"""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.bounds_ms, self.counts):
+            seen += bucket_count
+            if seen >= rank:
+                return bound
+        return self.max_ms
+    
+    def to_dict(self) -> Dict[str, Any]:
+        buckets = {f"le_{bound:g}": 0 for bound in self.bounds_ms}
+        cumulative = 0
+        for bound, bucket_count in zip(self.bounds_ms, self.counts):
+            cumulative += bucket_count
+            buckets[f"le_{bound:g}"] = cumulative
+        buckets["le_inf"] = self.count
+        
+        return {
+            'count': self.count,
+            'sum_ms': round(self.sum_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+            'p50_ms': self.quantile(0.5),
+            'p90_ms': self.quantile(0.9),
+            'p99_ms': self.quantile(0.99),
+            'buckets': buckets
+        }
+
+class MemoryGraphAPI:
+    """HTTP API over an in-process MemoryGraphService.
+    
+    Every handler runs on the server's single event loop and calls the service
+    directly, so the graph is never mutated from two threads at once. aiohttp
+    keeps HTTP/1.1 connections alive and answers pipelined requests in order.
+    Exports are the exception: they are serialized on a worker thread from a
+    snapshot or a dedicated connection, and only the socket writes are awaited.
+    """
+    
+    def __init__(self, graph_service: MemoryGraphService):
+        self.graph_service = graph_service
+        self.latency: Dict[str, LatencyHistogram] = {}
+        self.started_at = time.time()
+    
+    def create_app(self) -> "web.Application":
+        @web.middleware
+        async def latency_middleware(request, handler):
+            start_time = time.perf_counter()
+            try:
+                return await handler(request)
+            finally:
+                self.record_latency(request, (time.perf_counter() - start_time) * 1000)
+        
+        app = web.Application(middlewares=[latency_middleware], client_max_size=API_MAX_BODY_BYTES)
+        app.add_routes([
+            web.get('/health', self.handle_health),
+            web.get('/related/{memory_id}', self.handle_related),
+            web.post('/nodes', self.handle_upsert_nodes),
+            web.post('/relationships', self.handle_add_relationship),
+            web.post('/relationships/bulk', self.handle_relationships_bulk),
+            web.get('/export', self.handle_export),
+            web.get('/metrics/latency', self.handle_latency)
+        ])
+        app.on_cleanup.append(self.on_cleanup)
+        return app
+    
+    def record_latency(self, request, elapsed_ms: float):
+        # Group by route pattern so /related/<id> is one series
+        resource = request.match_info.route.resource
+        route = resource.canonical if resource is not None else "unmatched"
+        histogram = self.latency.get(route)
+        if histogram is None:
+            histogram = self.latency[route] = LatencyHistogram()
+        histogram.observe(elapsed_ms)
+    
+    async def on_cleanup(self, app):
+        self.graph_service.close()
+    
+    @staticmethod
+    def error_response(message: str, status: int = 400):
+        return web.json_response({"success": False, "error": message}, status=status)
+    
+    async def read_json(self, request):
+        try:
+            return await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(
+                text=json.dumps({"success": False, "error": "Request body must be JSON"}),
+                content_type="application/json"
+            )
+    
+    async def handle_health(self, request):
+        graph = self.graph_service.graph
+        return web.json_response({
+            'status': 'healthy',
+            'nodes': graph.number_of_nodes(),
+            'edges': graph.number_of_edges(),
+            'graph_version': self.graph_service.graph_version,
+            'uptime_seconds': round(time.time() - self.started_at, 1)
+        })
+    
+    async def handle_related(self, request):
+        query = request.query
+        try:
+            max_depth = int(query.get('max_depth', 2))
+            min_confidence = float(query.get('min_confidence', 0.5))
+            max_results = int(query['max_results']) if 'max_results' in query else None
+            fan_out = int(query['fan_out']) if 'fan_out' in query else None
+        except ValueError as e:
+            return self.error_response(f"Invalid query parameter: {e}")
+        
+        best_first = query.get('best_first', 'false').lower() in ('1', 'true', 'yes')
+        result = self.graph_service.find_related_memories(
+            request.match_info['memory_id'], max_depth=max_depth, min_confidence=min_confidence,
+            max_results=max_results, fan_out=fan_out, best_first=best_first
+        )
+        return web.json_response(result)
+    
+    async def handle_upsert_nodes(self, request):
+        """Upsert one node (a JSON object) or many (a JSON array)"""
+        payload = await self.read_json(request)
+        try:
+            if isinstance(payload, list):
+                upserted = self.graph_service.add_memory_nodes_bulk(payload)
+            else:
+                self.graph_service.add_memory_node(
+                    payload['memory_id'], payload['content'], payload['category'],
+                    payload.get('tags') or [], payload.get('metadata')
+                )
+                upserted = 1
+        except (KeyError, TypeError) as e:
+            return self.error_response(f"Invalid node: {e}")
+        
+        return web.json_response({'success': True, 'upserted': upserted})
+    
+    async def handle_add_relationship(self, request):
+        payload = await self.read_json(request)
+        try:
+            self.graph_service.add_relationship(
+                payload['source_id'], payload['target_id'], payload['relationship_type'],
+                payload.get('confidence', 1.0), payload.get('context', "")
+            )
+        except (KeyError, TypeError) as e:
+            return self.error_response(f"Invalid relationship: {e}")
+        
+        return web.json_response({'success': True, 'added': 1})
+    
+    async def handle_relationships_bulk(self, request):
+        payload = await self.read_json(request)
+        relationships = payload.get('relationships') if isinstance(payload, dict) else payload
+        if not isinstance(relationships, list):
+            return self.error_response("Expected a list of relationships")
+        
+        try:
+            added = self.graph_service.add_relationships_bulk(relationships)
+        except (KeyError, TypeError, IndexError) as e:
+            return self.error_response(f"Invalid relationship: {e}")
+        
+        return web.json_response({'success': True, 'added': added})
+    
+    async def handle_export(self, request):
+        """Stream the graph export in chunks instead of building it in memory"""
+        export_format = request.query.get('format', 'json')
+        if export_format not in EXPORT_FORMATS:
+            return self.error_response(f"Unknown export format: {export_format}")
+        
+        content_type = 'application/x-ndjson' if export_format == 'ndjson' else 'application/json'
+        response = web.StreamResponse(headers={'Content-Type': f'{content_type}; charset=utf-8'})
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        
+        blocks = self._export_blocks(export_format)
+        loop = asyncio.get_running_loop()
+        # One worker per export runs next() and close() in order, so the
+        # generator is never touched from two threads at once
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="graph-export")
+        try:
+            while True:
+                block = await loop.run_in_executor(executor, next, blocks, None)
+                if block is None:
+                    break
+                await response.write(block)
+        finally:
+            # Queued behind any in-flight read, so the export connection is always released
+            executor.submit(blocks.close)
+            executor.shutdown(wait=False)
+        
+        await response.write_eof()
+        return response
+    
+    def _export_blocks(self, export_format: str) -> Iterator[bytes]:
+        """Encoded export in ``EXPORT_CHUNK_BYTES`` blocks; iterated on a worker thread.
+        
+        Lazy mode streams from a dedicated connection rather than a pooled
+        reader, so slow clients cannot exhaust the pool, inside one read
+        transaction so nodes and links come from the same snapshot. Otherwise the live
+        graph is snapshotted here, on the event loop, before the first
+        block is produced, because handlers keep mutating it meanwhile.
+        """
+        service = self.graph_service
+        if service.lazy:
+            def produce():
+                with service.db.dedicated_reader() as conn, read_snapshot(conn):
+                    yield from self._encode_chunks(service.iter_d3_chunks(
+                        service.iter_d3_nodes_from_db(conn), service.iter_d3_links_from_db(conn),
+                        export_format
+                    ))
+            return produce()
+        
+        graph = service.graph
+        nodes = [service._d3_node(node_id, node_data) for node_id, node_data in graph.nodes(data=True)]
+        links = [service._d3_link(source, target, edge_data)
+                 for source, target, edge_data in graph.edges(data=True)]
+        return self._encode_chunks(service.iter_d3_chunks(nodes, links, export_format))
+    
+    @staticmethod
+    def _encode_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+        buffer, buffered = [], 0
+        for chunk in chunks:
+            buffer.append(chunk)
+            buffered += len(chunk)
+            if buffered >= EXPORT_CHUNK_BYTES:
+                yield ''.join(buffer).encode('utf-8')
+                buffer, buffered = [], 0
+        if buffer:
+            yield ''.join(buffer).encode('utf-8')
+    
+    async def handle_latency(self, request):
+        return web.json_response({
+            route: histogram.to_dict() for route, histogram in sorted(self.latency.items())
+        })
+
+def run_api_server(graph_service: MemoryGraphService, host: str = "localhost", port: int = API_PORT):
+    """Serve the graph API until interrupted"""
+    api = MemoryGraphAPI(graph_service)
+    web.run_app(api.create_app(), host=host, port=port,
+                keepalive_timeout=API_KEEPALIVE_SECONDS, access_log=None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Memory Relationship Graph Service")
+    parser.add_argument('--api-mode', action='store_true', help='Serve the HTTP API')
+    parser.add_argument('--host', default='localhost', help='API bind address')
+    parser.add_argument('--port', type=int, default=API_PORT, help='API port')
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help='Graph database path')
+    parser.add_argument('--backend', default='networkx', choices=['networkx', 'compact'],
+                        help='In-memory graph backend')
+    parser.add_argument('--log-file', help='Append API logs here instead of stderr')
+    parser.add_argument('--log-level', choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help='API log level (default: INFO with --log-file, WARNING otherwise)')
+    args = parser.parse_args()
+    
+    if not args.api_mode:
+        graph_service = MemoryGraphService(args.db)
+        
+        # Example usage
+        related = graph_service.find_related_memories("example_memory_id")
+        print(json.dumps(related, indent=2))
+        return
     
-    # Example usage
-    related = graph_service.find_related_memories("example_memory_id")
-    print(json.dumps(related, indent=2))
+    if not AIOHTTP_AVAILABLE:
+        print("❌ API mode requires aiohttp (pip install aiohttp)")
+        sys.exit(1)
+    
+    # Per-refresh INFO lines only go to a file; on stderr they would pile up unread
+    log_level = args.log_level or ("INFO" if args.log_file else "WARNING")
+    logging.basicConfig(level=getattr(logging, log_level), filename=args.log_file,
+                        format="%(asctime)s %(levelname)s %(message)s")
+    graph_service = MemoryGraphService(args.db, lazy=True, backend=args.backend)
+    graph_service.start_analytics_job()
+    run_api_server(graph_service, host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -9,68 +9,94 @@ import sys
 import json
 import time
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import Dict, List, Any
+import sqlite3
 import tempfile
+from importlib.util import spec_from_file_location, module_from_spec
 
-# Add path for local imports
-sys.path.append('/Users/josephhillin/workspace/mcp-central')
-sys.path.append('/Users/josephhillin/workspace/mcp-central/agents')
-sys.path.append('/Users/josephhillin/workspace/mcp-central/agents/temporal-engine')
+MCP_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(MCP_ROOT)
+
+def load_module(name: str, relative_path: str):
+    """Import a component script by path (the file names are hyphenated)"""
+    path = os.path.join(MCP_ROOT, relative_path)
+    if not os.path.exists(path):
+        raise ImportError(f"No such file: {path}")
+    spec = spec_from_file_location(name, path)
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
 
 try:
     # Import components with proper error handling
-    from temporal_processor import TemporalIntelligenceEngine
+    temporal_processor = load_module("temporal_processor", "agents/temporal-engine/temporal-processor.py")
+    TemporalIntelligenceEngine = temporal_processor.TemporalIntelligenceEngine
     temporal_import_success = True
 except ImportError as e:
     print(f"Warning: Could not import TemporalIntelligenceEngine: {e}")
     temporal_import_success = False
 
 try:
-    from graph.memory_graph_service import MemoryGraphService
+    memory_graph_service = load_module("memory_graph_service", "graph/memory-graph-service.py")
+    MemoryGraphService = memory_graph_service.MemoryGraphService
     graph_import_success = True
 except ImportError as e:
     print(f"Warning: Could not import MemoryGraphService: {e}")
     graph_import_success = False
 
 try:
-    from security.audit_system import MemoryAuditSystem
+    audit_system = load_module("audit_system", "security/audit-system.py")
+    MemoryAuditSystem = audit_system.MemoryAuditSystem
     audit_import_success = True
 except ImportError as e:
     print(f"Warning: Could not import MemoryAuditSystem: {e}")
     audit_import_success = False
 
 try:
-    from memory_seeds.enhanced_validator import EnhancedMemoryValidator
+    enhanced_validator = load_module("enhanced_validator", "memory-seeds/enhanced-validator.py")
+    EnhancedMemoryValidator = enhanced_validator.EnhancedMemoryValidator
     validator_import_success = True
 except ImportError as e:
     print(f"Warning: Could not import EnhancedMemoryValidator: {e}")
     validator_import_success = False
 
 try:
-    from langflow.memory_mcp_bridge import LangFlowMCPBridge
+    memory_mcp_bridge = load_module("memory_mcp_bridge", "langflow/memory-mcp-bridge.py")
+    LangFlowMCPBridge = memory_mcp_bridge.LangFlowMCPBridge
     langflow_import_success = True
 except ImportError as e:
     print(f"Warning: Could not import LangFlowMCPBridge: {e}")
     langflow_import_success = False
 
 try:
-    from team.team_memory_manager import TeamMemoryManager
+    team_memory_manager = load_module("team_memory_manager", "team/team-memory-manager.py")
+    TeamMemoryManager = team_memory_manager.TeamMemoryManager
     team_import_success = True
 except ImportError as e:
     print(f"Warning: Could not import TeamMemoryManager: {e}")
     team_import_success = False
 
 try:
-    from raycast_config_registry import RaycastConfigRegistry
+    raycast_config_registry = load_module("raycast_config_registry", "raycast-config-registry.py")
+    RaycastConfigRegistry = raycast_config_registry.RaycastConfigRegistry
     raycast_import_success = True
 except ImportError as e:
     print(f"Warning: Could not import RaycastConfigRegistry: {e}")
     raycast_import_success = False
 
+try:
+    memory_cli = load_module("memory_cli", "bin/memory-cli.py")
+    MemoryCLI = memory_cli.MemoryCLI
+    cli_import_success = True
+except ImportError as e:
+    print(f"Warning: Could not import MemoryCLI: {e}")
+    cli_import_success = False
+
 class SystemIntegrationTests:
     def __init__(self):
-        self.base_path = "/Users/josephhillin/workspace/mcp-central"
+        self.base_path = MCP_ROOT
         self.test_results = {}
         self.test_data = {}
         
@@ -83,9 +109,30 @@ class SystemIntegrationTests:
             ("Component Initialization", self.test_component_initialization),
             ("Memory Validation", self.test_memory_validation),
             ("Graph Operations", self.test_graph_operations),
+            ("Graph Bulk Ingest", self.test_graph_bulk_ingest),
+            ("Graph Traversal Limits", self.test_graph_traversal_limits),
+            ("Graph Lazy Payloads", self.test_graph_lazy_payloads),
+            ("Graph Related Cache", self.test_graph_related_cache),
+            ("Graph Metrics Watermark", self.test_graph_metrics_watermark),
+            ("Graph Export Formats", self.test_graph_export_formats),
+            ("Graph Backend Parity", self.test_graph_backend_parity),
             ("Temporal Intelligence", self.test_temporal_intelligence),
+            ("Temporal Access Recorder", self.test_temporal_access_recorder),
+            ("Temporal Access Transaction", self.test_temporal_access_transaction),
+            ("Temporal Access Compaction", self.test_temporal_access_compaction),
+            ("Temporal Forgotten Gems Plan", self.test_temporal_forgotten_gems_plan),
+            ("Temporal Decay Backfill", self.test_temporal_decay_backfill),
+            ("Temporal Rescore Count", self.test_temporal_rescore_count),
+            ("Temporal Review Queue", self.test_temporal_review_queue),
+            ("Temporal Backend Parity", self.test_temporal_backend_parity),
+            ("Cron Schedule", self.test_cron_schedule),
             ("Security & Audit", self.test_security_audit),
             ("Team Memory Sharing", self.test_team_memory_sharing),
+            ("Team Accessible Pagination", self.test_team_accessible_pagination),
+            ("Team ACL Invalidation", self.test_team_acl_invalidation),
+            ("Team Share Sweeper", self.test_team_share_sweeper),
+            ("Team Access Log Flush", self.test_team_access_log_flush),
+            ("Team Search Isolation", self.test_team_search_isolation),
             ("LangFlow Integration", self.test_langflow_integration),
             ("Raycast Config Sync", self.test_raycast_config_sync),
             ("CLI Interface", self.test_cli_interface),
@@ -106,7 +153,8 @@ class SystemIntegrationTests:
                 "validator": validator_import_success,
                 "langflow_bridge": langflow_import_success,
                 "team_manager": team_import_success,
-                "raycast_registry": raycast_import_success
+                "raycast_registry": raycast_import_success,
+                "memory_cli": cli_import_success
             }
         }
         
@@ -313,6 +361,320 @@ class SystemIntegrationTests:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def test_graph_bulk_ingest(self) -> Dict[str, Any]:
+        """Test batched node and relationship ingest"""
+        if not graph_import_success:
+            return {"success": False, "error": "Graph service not available", "skipped": True}
+            
+        try:
+            graph_service = MemoryGraphService(":memory:")
+            
+            node_count = 1000
+            nodes_added = graph_service.add_memory_nodes_bulk(
+                (f"bulk_{i}", f"Bulk memory {i}", "knowledge_technical", ["bulk"])
+                for i in range(node_count)
+            )
+            edges_added = graph_service.add_relationships_bulk(
+                (f"bulk_{i}", f"bulk_{i + 1}", "follows", 0.9)
+                for i in range(node_count - 1)
+            )
+            
+            with graph_service.db.reader() as conn:
+                stored_nodes = conn.execute("SELECT COUNT(*) FROM memory_nodes").fetchone()[0]
+                stored_edges = conn.execute("SELECT COUNT(*) FROM memory_relationships").fetchone()[0]
+            
+            return {
+                "success": (
+                    nodes_added == stored_nodes == len(graph_service.graph.nodes()) == node_count and
+                    edges_added == stored_edges == len(graph_service.graph.edges()) == node_count - 1
+                ),
+                "nodes_added": nodes_added,
+                "edges_added": edges_added,
+                "details": "Bulk ingest stored and loaded all rows"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_graph_traversal_limits(self) -> Dict[str, Any]:
+        """Test related-memory traversal dedupe, depth, fan-out and result caps"""
+        if not graph_import_success:
+            return {"success": False, "error": "Graph service not available", "skipped": True}
+            
+        try:
+            graph_service = MemoryGraphService(":memory:")
+            
+            # Hub with many spokes, each spoke also linked back to the hub
+            graph_service.add_relationships_bulk(
+                [("hub", f"spoke_{i}", "related_to", 0.5 + i / 100) for i in range(40)] +
+                [(f"spoke_{i}", "hub", "related_to", 0.9) for i in range(40)] +
+                [("spoke_0", "leaf", "related_to", 0.9)]
+            )
+            
+            full = graph_service.find_related_memories("hub", max_depth=2)["related"]
+            one_hop = graph_service.find_related_memories("hub", max_depth=1)["related"]
+            fanned = graph_service.find_related_memories("hub", max_depth=1, fan_out=5)["related"]
+            capped = graph_service.find_related_memories("hub", max_depth=2, max_results=10, best_first=True)["related"]
+            
+            memory_ids = [r["memory_id"] for r in full]
+            
+            return {
+                "success": (
+                    len(memory_ids) == len(set(memory_ids)) == 41 and
+                    "hub" not in memory_ids and
+                    all(r["depth"] == 1 for r in one_hop) and
+                    [r["memory_id"] for r in fanned] == [f"spoke_{i}" for i in range(39, 34, -1)] and
+                    len(capped) == 10
+                ),
+                "related_found": len(full),
+                "details": "Traversal limits respected"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_graph_lazy_payloads(self) -> Dict[str, Any]:
+        """Test that lazy node payloads load on first access and are evicted past capacity"""
+        if not graph_import_success:
+            return {"success": False, "error": "Graph service not available", "skipped": True}
+            
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_path = os.path.join(temp_dir, "graph.db")
+                
+                writer = MemoryGraphService(db_path)
+                writer.add_memory_nodes_bulk(
+                    (f"lazy_{i}", f"Lazy memory {i}", "knowledge_technical", ["lazy"], {"index": i})
+                    for i in range(10)
+                )
+                writer.close()
+                
+                graph_service = MemoryGraphService(db_path, lazy=True, payload_cache_size=3)
+                adjacency_only = all(
+                    'content' not in graph_service.graph.nodes[f"lazy_{i}"] for i in range(10)
+                )
+                empty_at_start = len(graph_service.payload_cache) == 0
+                
+                first = graph_service.get_node_data("lazy_0")
+                loaded_on_miss = graph_service.cache_stats()["payload"]["misses"] == 1
+                graph_service.get_node_data("lazy_0")
+                hit_on_repeat = graph_service.cache_stats()["payload"]["hits"] == 1
+                
+                # Touching more nodes than the cache holds pushes lazy_0 out
+                for i in range(1, 5):
+                    graph_service.get_node_data(f"lazy_{i}")
+                bounded = len(graph_service.payload_cache) == 3
+                evicted = graph_service.payload_cache.get("lazy_0") is None
+                reloaded = graph_service.get_node_data("lazy_0")
+                graph_service.close()
+            
+            return {
+                "success": (
+                    adjacency_only and empty_at_start and loaded_on_miss and hit_on_repeat and
+                    first["content"] == "Lazy memory 0" and first["metadata"] == {"index": 0} and
+                    bounded and evicted and reloaded == first
+                ),
+                "cache_size": 3,
+                "details": "Lazy payloads loaded on demand within the LRU bound"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_graph_related_cache(self) -> Dict[str, Any]:
+        """Test that related-memory results are cached and invalidated by graph writes"""
+        if not graph_import_success:
+            return {"success": False, "error": "Graph service not available", "skipped": True}
+            
+        try:
+            graph_service = MemoryGraphService(":memory:")
+            graph_service.add_relationships_bulk(
+                [(f"cache_{i}", f"cache_{i + 1}", "follows", 0.9) for i in range(5)]
+            )
+            
+            first = graph_service.find_related_memories("cache_0", max_depth=2)
+            after_first = graph_service.cache_stats()["related"]
+            second = graph_service.find_related_memories("cache_0", max_depth=2)
+            after_second = graph_service.cache_stats()["related"]
+            cache_hit = (
+                second is first and
+                after_second["hits"] == after_first["hits"] + 1 and
+                after_second["misses"] == after_first["misses"]
+            )
+            
+            # A new edge bumps graph_version, so the same query misses and sees it
+            version_before = graph_service.graph_version
+            graph_service.add_relationship("cache_0", "cache_new", "related_to", 0.9)
+            third = graph_service.find_related_memories("cache_0", max_depth=2)
+            after_third = graph_service.cache_stats()["related"]
+            cache_miss = (
+                graph_service.graph_version > version_before and
+                after_third["misses"] == after_second["misses"] + 1 and
+                "cache_new" in [r["memory_id"] for r in third["related"]] and
+                "cache_new" not in [r["memory_id"] for r in first["related"]]
+            )
+            graph_service.close()
+            
+            return {
+                "success": cache_hit and cache_miss,
+                "cache_hit": cache_hit,
+                "cache_miss_after_write": cache_miss,
+                "details": "Related cache served repeats and dropped stale results"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_graph_metrics_watermark(self) -> Dict[str, Any]:
+        """Test that metrics refreshes pick up edges written by another service instance"""
+        if not graph_import_success:
+            return {"success": False, "error": "Graph service not available", "skipped": True}
+        if not memory_graph_service.ANALYTICS_AVAILABLE:
+            return {"success": False, "error": "Graph analytics requires numpy", "skipped": True}
+            
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_path = os.path.join(temp_dir, "graph.db")
+                
+                graph_service = MemoryGraphService(db_path)
+                graph_service.add_relationships_bulk(
+                    [(f"wm_a{i}", f"wm_a{i + 1}", "related_to", 0.9) for i in range(50)] +
+                    [(f"wm_b{i}", f"wm_b{i + 1}", "related_to", 0.9) for i in range(50)]
+                )
+                first_mode = graph_service.refresh_graph_metrics()["mode"]
+                
+                # A second process joins the two chains
+                other_service = MemoryGraphService(db_path)
+                other_service.add_relationship("wm_a0", "wm_b0", "related_to", 0.9)
+                other_service.close()
+                
+                stale = graph_service.metrics_stale()
+                refresh = graph_service.refresh_graph_metrics()
+                metrics = graph_service.node_metrics
+                joined = metrics["wm_a50"][1] == metrics["wm_b50"][1]
+                graph_service.close()
+                
+                # After a restart the stored watermark still lines up
+                restarted = MemoryGraphService(db_path)
+                stale_after_restart = restarted.metrics_stale()
+                restarted.close()
+            
+            return {
+                "success": (
+                    first_mode == "full" and stale and refresh["mode"] == "incremental" and
+                    joined and not stale_after_restart
+                ),
+                "refresh_mode": refresh["mode"],
+                "details": "Incremental refresh merged components across processes"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_graph_export_formats(self) -> Dict[str, Any]:
+        """Test that json, compact and ndjson exports parse and agree on counts"""
+        if not graph_import_success:
+            return {"success": False, "error": "Graph service not available", "skipped": True}
+            
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                graph_service = MemoryGraphService(os.path.join(temp_dir, "graph.db"))
+                graph_service.add_memory_nodes_bulk(
+                    (f"export_{i}", f"Export memory {i}", "knowledge_technical", ["export"])
+                    for i in range(50)
+                )
+                graph_service.add_relationships_bulk(
+                    [(f"export_{i}", f"export_{i + 1}", "follows", 0.8) for i in range(49)]
+                )
+                
+                exported = {}
+                for from_db in (True, False):
+                    for export_format in ("json", "compact", "ndjson"):
+                        path = os.path.join(temp_dir, f"export-{from_db}.{export_format}")
+                        result = graph_service.export_graph_json(path, export_format=export_format,
+                                                                 from_db=from_db)
+                        with open(path) as f:
+                            if export_format == "ndjson":
+                                items = [json.loads(line) for line in f]
+                                nodes = [item for item in items if item["kind"] == "node"]
+                                links = [item for item in items if item["kind"] == "link"]
+                            else:
+                                document = json.load(f)
+                                nodes, links = document["nodes"], document["links"]
+                        exported[(from_db, export_format)] = (
+                            len(nodes), len(links), result["node_count"], result["edge_count"]
+                        )
+                graph_service.close()
+            
+            return {
+                "success": set(exported.values()) == {(50, 49, 50, 49)},
+                "exports": {f"{'db' if from_db else 'graph'}:{export_format}": counts
+                            for (from_db, export_format), counts in exported.items()},
+                "details": "All export formats parse with matching node and edge counts"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_graph_backend_parity(self) -> Dict[str, Any]:
+        """Test that the compact and networkx backends agree on edges, neighbors and traversal"""
+        if not graph_import_success:
+            return {"success": False, "error": "Graph service not available", "skipped": True}
+        if not memory_graph_service.COMPACT_BACKEND_AVAILABLE:
+            return {"success": False, "error": "Compact backend requires numpy", "skipped": True}
+            
+        try:
+            relationships = (
+                [(f"parity_{i}", f"parity_{(i * 7 + 3) % 60}", "related_to", round(0.3 + (i % 7) / 10, 2))
+                 for i in range(60)] +
+                [(f"parity_{i}", f"parity_{i + 1}", "follows", 0.6) for i in range(0, 60, 5)] +
+                # None confidences sit in their own component, away from the traversal seeds
+                [(f"parity_null_{i}", f"parity_null_{i + 1}", "follows", None) for i in range(3)] +
+                # Re-sent edge: the later confidence wins
+                [("parity_0", "parity_3", "related_to", 0.95)]
+            )
+            
+            services = {}
+            for backend in ("networkx", "compact"):
+                graph_service = MemoryGraphService(":memory:", backend=backend)
+                graph_service.add_relationships_bulk(relationships)
+                # Single edges after the bulk load exercise the compact delta buffer
+                graph_service.add_relationship("parity_1", "parity_59", "related_to", 0.9)
+                graph_service.add_relationship("parity_0", "parity_3", "related_to", 0.85)
+                services[backend] = graph_service
+            
+            def describe(graph_service) -> Dict[str, Any]:
+                graph = graph_service.graph
+                return {
+                    "edges": sorted(
+                        (source, target, edge_data['relationship_type'], edge_data['confidence'])
+                        for source, target, edge_data in graph.edges(data=True)
+                    ),
+                    "neighbors": {node_id: sorted(graph.neighbors(node_id)) for node_id in graph.nodes()},
+                    "traversals": [
+                        graph_service.find_related_memories(seed, max_depth=3, min_confidence=0.4,
+                                                            best_first=best_first)["related"]
+                        for seed in ("parity_0", "parity_11", "parity_42")
+                        for best_first in (False, True)
+                    ]
+                }
+            
+            networkx_view = describe(services["networkx"])
+            compact_view = describe(services["compact"])
+            for graph_service in services.values():
+                graph_service.close()
+            
+            mismatched = [key for key in networkx_view if networkx_view[key] != compact_view[key]]
+            return {
+                "success": not mismatched and len(networkx_view["edges"]) > 0,
+                "mismatched": mismatched,
+                "edges": len(networkx_view["edges"]),
+                "details": "Compact backend matches networkx"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
     async def test_temporal_intelligence(self) -> Dict[str, Any]:
         """Test temporal intelligence features"""
         if not temporal_import_success:
@@ -352,6 +714,509 @@ class SystemIntegrationTests:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def test_temporal_access_recorder(self) -> Dict[str, Any]:
+        """Test that buffered access events are all recorded once the engine closes"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_path = os.path.join(temp_dir, "temporal.db")
+                event_count = 300
+                
+                temporal_engine = TemporalIntelligenceEngine(db_path=db_path)
+                access_recorder = temporal_engine.access_recorder()
+                for i in range(event_count):
+                    access_recorder.record(f"buffered_mem_{i % 3}", "integration_test", "test_suite",
+                                           query_type="search", category="knowledge_technical")
+                shared = temporal_engine.access_recorder() is access_recorder
+                temporal_engine.close()
+                
+                reopened = TemporalIntelligenceEngine(db_path=db_path)
+                with reopened.db.reader() as conn:
+                    logged = conn.execute("SELECT COUNT(*) FROM access_log").fetchone()[0]
+                    counted = conn.execute(
+                        "SELECT SUM(access_count) FROM memory_temporal_data WHERE category = ?",
+                        ("knowledge_technical",)
+                    ).fetchone()[0]
+                reopened.close()
+            
+            return {
+                "success": shared and logged == counted == event_count,
+                "events_logged": logged,
+                "details": "Buffered access events drained on close"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_temporal_access_transaction(self) -> Dict[str, Any]:
+        """Test that an access's log insert and temporal update commit or roll back together"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            temporal_engine = TemporalIntelligenceEngine(db_path=":memory:")
+            
+            def access_state(memory_id: str) -> tuple:
+                with temporal_engine.db.reader() as conn:
+                    logged = conn.execute(
+                        "SELECT COUNT(*) FROM access_log WHERE memory_id = ?", (memory_id,)
+                    ).fetchone()[0]
+                    row = conn.execute(
+                        "SELECT access_count FROM memory_temporal_data WHERE memory_id = ?", (memory_id,)
+                    ).fetchone()
+                return logged, row[0] if row else 0
+            
+            # One access is one BEGIN ... COMMIT around every statement it runs
+            statements = []
+            writer = temporal_engine.db._writer
+            writer.set_trace_callback(statements.append)
+            try:
+                temporal_engine.record_memory_access("txn_mem", "integration_test", "test_suite")
+            finally:
+                writer.set_trace_callback(None)
+            transaction_control = [s.split()[0].upper() for s in statements
+                                   if s.split()[0].upper() in ("BEGIN", "COMMIT", "ROLLBACK")]
+            single_commit = (
+                transaction_control == ["BEGIN", "COMMIT"] and
+                statements[0].startswith("BEGIN") and statements[-1] == "COMMIT"
+            )
+            
+            # A failing relevance update rolls the log insert and counters back with it
+            update_sql = temporal_processor.UPDATE_RELEVANCE_SQL
+            temporal_processor.UPDATE_RELEVANCE_SQL = "UPDATE missing_table SET a = ?, b = ? WHERE c = ?"
+            try:
+                temporal_engine.record_memory_access("txn_mem", "integration_test", "test_suite")
+                failed = False
+            except Exception:
+                failed = True
+            finally:
+                temporal_processor.UPDATE_RELEVANCE_SQL = update_sql
+            rolled_back = failed and access_state("txn_mem") == (1, 1)
+            temporal_engine.close()
+            
+            return {
+                "success": single_commit and rolled_back,
+                "single_commit": single_commit,
+                "rolled_back": rolled_back,
+                "details": "Access log and temporal data written atomically"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_temporal_access_compaction(self) -> Dict[str, Any]:
+        """Test daily access buckets and archiving old access_log rows into partitions"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            temporal_engine = TemporalIntelligenceEngine(db_path=":memory:")
+            now = datetime.now()
+            
+            def accesses(memory_id: str, days_ago: int, count: int) -> List[tuple]:
+                accessed = (now - timedelta(days=days_ago)).isoformat()
+                return [(memory_id, accessed, "integration_test", "test_suite", "retrieval")] * count
+            
+            events = (
+                accesses("bucket_mem", 60, 3) + accesses("bucket_mem", 45, 2) +
+                accesses("bucket_mem", 0, 4) + accesses("bucket_old", 500, 1)
+            )
+            temporal_engine.record_memory_accesses(events)
+            
+            def daily_counts() -> Dict[tuple, int]:
+                with temporal_engine.db.reader() as conn:
+                    return {
+                        (memory_id, access_date): access_count
+                        for memory_id, access_date, access_count in conn.execute(
+                            "SELECT memory_id, access_date, access_count FROM access_daily_counts"
+                        )
+                    }
+            
+            expected_buckets = {}
+            for memory_id, accessed, *_ in events:
+                bucket = (memory_id, accessed[:10])
+                expected_buckets[bucket] = expected_buckets.get(bucket, 0) + 1
+            buckets_recorded = daily_counts() == expected_buckets
+            
+            result = temporal_engine.compact_access_log()
+            
+            with temporal_engine.db.reader() as conn:
+                hot_rows = conn.execute("SELECT COUNT(*) FROM access_log").fetchone()[0]
+                partitions = [row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE 'access_log\\_%' ESCAPE '\\'"
+                )]
+                archived_rows = sum(
+                    conn.execute(f"SELECT COUNT(*) FROM {partition}").fetchone()[0]
+                    for partition in partitions
+                )
+            buckets_after = daily_counts()
+            temporal_engine.close()
+            
+            # Rows older than the 30-day hot window move out; the 500-day-old one
+            # lands in a partition past archive retention, and its bucket expires too
+            old_partition = f"access_log_{(now - timedelta(days=500)).strftime('%Y%m')}"
+            expected_buckets.pop(("bucket_old", events[-1][1][:10]))
+            
+            return {
+                "success": (
+                    buckets_recorded and
+                    result["archived_log_rows"] == 6 and hot_rows == 4 and
+                    result["dropped_partitions"] == [old_partition] and
+                    old_partition not in partitions and archived_rows == 5 and
+                    result["deleted_buckets"] == 1 and buckets_after == expected_buckets
+                ),
+                "archived_log_rows": result["archived_log_rows"],
+                "partitions": partitions,
+                "details": "Daily buckets kept through compaction"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_temporal_forgotten_gems_plan(self) -> Dict[str, Any]:
+        """Test that the forgotten-gems query is answered from its partial index"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            temporal_engine = TemporalIntelligenceEngine(db_path=":memory:")
+            accessed = (datetime.now() - timedelta(days=90)).isoformat()
+            temporal_engine.record_memory_accesses([
+                (f"gem_mem_{i}", accessed, "integration_test", "test_suite", "retrieval")
+                for i in range(200) for _ in range(i % 10)
+            ])
+            temporal_engine.recompute_all_relevance()
+            
+            # Capture the statement exactly as the engine runs it
+            statements = []
+            writer = temporal_engine.db._writer
+            writer.set_trace_callback(statements.append)
+            try:
+                gems = temporal_engine.get_forgotten_gems()
+            finally:
+                writer.set_trace_callback(None)
+            query = next(s for s in statements if "FROM memory_temporal_data" in s)
+            plan = " ".join(row[-1] for row in writer.execute(f"EXPLAIN QUERY PLAN {query}"))
+            temporal_engine.close()
+            
+            return {
+                "success": (
+                    "USING INDEX idx_temporal_forgotten_gems" in plan and
+                    "TEMP B-TREE" not in plan and
+                    len(gems) == 10 and gems[0]["historical_access_count"] == 9
+                ),
+                "query_plan": plan,
+                "details": "Forgotten gems read from idx_temporal_forgotten_gems in index order"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_temporal_decay_backfill(self) -> Dict[str, Any]:
+        """Test that migrating a legacy database gives existing rows their category decay values"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_path = os.path.join(temp_dir, "temporal.db")
+                graph_db_path = os.path.join(temp_dir, "graph.db")
+                accessed = datetime.now().isoformat()
+                
+                # Pre-migration layout: no category column, every row at medium/60
+                legacy = sqlite3.connect(db_path)
+                legacy.execute('''
+                    CREATE TABLE memory_temporal_data (
+                        memory_id TEXT PRIMARY KEY, created_timestamp TEXT, last_accessed TEXT,
+                        access_count INTEGER DEFAULT 0, access_frequency REAL DEFAULT 0.0,
+                        staleness_factor REAL DEFAULT 0.0, relevance_score REAL DEFAULT 1.0,
+                        decay_rate TEXT, half_life_days INTEGER, next_review_date TEXT, temporal_tags TEXT
+                    )
+                ''')
+                legacy.executemany('''
+                    INSERT INTO memory_temporal_data
+                    (memory_id, created_timestamp, last_accessed, access_count, decay_rate, half_life_days)
+                    VALUES (?, ?, ?, 1, 'medium', 60)
+                ''', [(memory_id, accessed, accessed)
+                      for memory_id in ("legacy_tech", "legacy_active", "legacy_unknown")])
+                legacy.commit()
+                legacy.close()
+                
+                graph_db = sqlite3.connect(graph_db_path)
+                graph_db.execute("CREATE TABLE memory_nodes (memory_id TEXT PRIMARY KEY, category TEXT)")
+                graph_db.executemany("INSERT INTO memory_nodes VALUES (?, ?)", [
+                    ("legacy_tech", "knowledge_technical"), ("legacy_active", "project_active")
+                ])
+                graph_db.commit()
+                graph_db.close()
+                
+                temporal_engine = TemporalIntelligenceEngine(
+                    config_path=f"{self.base_path}/memory-policies/temporal-schema.yaml",
+                    db_path=db_path
+                )
+                backfilled = temporal_engine.backfill_categories_from_graph(graph_db_path)
+                
+                with temporal_engine.db.reader() as conn:
+                    rows = {
+                        memory_id: (category, decay_rate, half_life_days)
+                        for memory_id, category, decay_rate, half_life_days in conn.execute(
+                            "SELECT memory_id, category, decay_rate, half_life_days FROM memory_temporal_data"
+                        )
+                    }
+                decay_table = temporal_engine.decay_table
+                schema_version = temporal_engine.schema_version
+                temporal_engine.close()
+            
+            expected = {
+                "legacy_tech": ("knowledge_technical", *decay_table.params("knowledge_technical")),
+                "legacy_active": ("project_active", *decay_table.params("project_active")),
+                "legacy_unknown": (None, *decay_table.params(None))
+            }
+            
+            return {
+                "success": (
+                    schema_version == 5 and backfilled == 2 and rows == expected and
+                    expected["legacy_tech"][1:] == ("very_slow", 365) and
+                    expected["legacy_active"][1:] == ("fast", 30)
+                ),
+                "backfilled": backfilled,
+                "rows": rows,
+                "details": "Legacy rows carry their category's decay parameters"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_temporal_rescore_count(self) -> Dict[str, Any]:
+        """Test that a bulk rescore reports only rows it wrote, not ones accessed meanwhile"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            temporal_engine = TemporalIntelligenceEngine(db_path=":memory:")
+            accessed = (datetime.now() - timedelta(days=100)).isoformat()
+            temporal_engine.record_memory_accesses([
+                (f"rescore_mem_{i}", accessed, "integration_test", "test_suite", "retrieval")
+                for i in range(5)
+            ])
+            
+            # Access one memory between the rescore's read and its write
+            RelevanceSnapshot = temporal_processor.RelevanceSnapshot
+            evaluate = RelevanceSnapshot.evaluate
+            def evaluate_with_access(snapshot, *args, **kwargs):
+                temporal_engine.record_memory_access("rescore_mem_0", "integration_test", "test_suite")
+                return evaluate(snapshot, *args, **kwargs)
+            
+            RelevanceSnapshot.evaluate = evaluate_with_access
+            try:
+                result = temporal_engine.recompute_all_relevance()
+            finally:
+                RelevanceSnapshot.evaluate = evaluate
+            
+            with temporal_engine.db.reader() as conn:
+                fresh_score = conn.execute(
+                    "SELECT relevance_score FROM memory_temporal_data WHERE memory_id = ?", ("rescore_mem_0",)
+                ).fetchone()[0]
+            temporal_engine.close()
+            
+            return {
+                "success": result["updated"] == 4 and fresh_score == 1.0,
+                "updated": result["updated"],
+                "details": "Concurrently accessed row skipped and not counted"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_temporal_review_queue(self) -> Dict[str, Any]:
+        """Test that each review queue section picks up the memory built for it"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            temporal_engine = TemporalIntelligenceEngine(
+                config_path=f"{self.base_path}/memory-policies/temporal-schema.yaml",
+                db_path=":memory:"
+            )
+            now = datetime.now()
+            
+            def at(days_ago: float) -> str:
+                return (now - timedelta(days=days_ago)).isoformat()
+            
+            events = []
+            # Heavily used 100 days ago, untouched since
+            events += [("queue_gem", at(100), "old_work", "test_suite", "retrieval", "project_active")] * 6
+            # Exactly the minimum number of recent accesses, five days before its 90-day retention ends
+            temporal_engine.track_memory("queue_expiring", category="project_active", created_timestamp=at(85))
+            events += [("queue_expiring", at(10), "old_work", "test_suite", "retrieval", "project_active")] * 2
+            # More accesses every day for two weeks, all in today's context
+            for days_ago in range(14):
+                events += [("queue_trending", at(days_ago), "queue_context", "test_suite", "retrieval",
+                            "project_active")] * (14 - days_ago)
+            # Only ever used in today's context, but not for the last week
+            events += [("queue_context", at(days_ago), "queue_context", "test_suite", "retrieval",
+                        "project_active") for days_ago in range(7, 12)]
+            temporal_engine.record_memory_accesses(events)
+            temporal_engine.recompute_all_relevance()
+            
+            review_queue = temporal_engine.generate_review_queue(refresh=True)
+            sections = {section: [entry["memory_id"] for entry in entries]
+                        for section, entries in review_queue.items()}
+            
+            for _ in range(temporal_processor.REVIEW_QUEUE_RUNS_KEPT + 5):
+                temporal_engine.materialize_review_queue()
+            with temporal_engine.db.reader() as conn:
+                runs_kept = conn.execute("SELECT COUNT(*) FROM review_queue_runs").fetchone()[0]
+            temporal_engine.close()
+            
+            return {
+                "success": (
+                    sections["forgotten_gems"] == ["queue_gem"] and
+                    sections["expiring_soon"] == ["queue_expiring"] and
+                    sections["trending_up"] == ["queue_trending"] and
+                    sections["context_relevant"] == ["queue_context"] and
+                    runs_kept == temporal_processor.REVIEW_QUEUE_RUNS_KEPT
+                ),
+                "sections": sections,
+                "runs_kept": runs_kept,
+                "details": "All four review sections populated; run history pruned"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_temporal_backend_parity(self) -> Dict[str, Any]:
+        """Test that the memory backend records, scores and queues like the sqlite backend"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            now = datetime.now()
+            
+            def at(days_ago: float) -> str:
+                return (now - timedelta(days=days_ago)).isoformat()
+            
+            events = [("parity_gem", at(100), "old_work", "test_suite", "retrieval", "project_active")] * 6
+            for days_ago in range(14):
+                events += [("parity_trending", at(days_ago), "parity_context", "test_suite", "retrieval",
+                            "knowledge_technical")] * (14 - days_ago)
+            events += [(f"parity_mem_{i}", at(i * 3), "parity_context", "test_suite", "retrieval")
+                       for i in range(20)]
+            memory_ids = sorted({event[0] for event in events} | {"parity_tracked"})
+            
+            def run_scenario(temporal_engine) -> Dict[str, Any]:
+                temporal_engine.track_memory("parity_tracked", category="project_active",
+                                             created_timestamp=at(85))
+                temporal_engine.record_memory_accesses(events)
+                temporal_engine.record_memory_access("parity_tracked", "parity_context", "test_suite",
+                                                     category="project_active")
+                updated = temporal_engine.recompute_all_relevance()["updated"]
+                scores = temporal_engine.score_memories(memory_ids)
+                review_queue = temporal_engine.generate_review_queue(refresh=True)
+                
+                with temporal_engine.db.reader() as conn:
+                    logged = conn.execute("SELECT COUNT(*) FROM access_log").fetchone()[0]
+                    buckets = conn.execute('''
+                        SELECT memory_id, access_date, access_count FROM access_daily_counts
+                        ORDER BY memory_id, access_date
+                    ''').fetchall()
+                    rows = conn.execute('''
+                        SELECT memory_id, access_count, category, decay_rate, half_life_days, relevance_score
+                        FROM memory_temporal_data ORDER BY memory_id
+                    ''').fetchall()
+                temporal_engine.close()
+                
+                return {
+                    "logged": logged,
+                    "buckets": buckets,
+                    "rows": [(*row[:5], round(row[5], 4)) for row in rows],
+                    "updated": updated,
+                    "scores": {memory_id: round(score, 4) for memory_id, score in scores.items()},
+                    "review_queue": {section: [entry["memory_id"] for entry in entries]
+                                     for section, entries in review_queue.items()}
+                }
+            
+            config_path = f"{self.base_path}/memory-policies/temporal-schema.yaml"
+            with tempfile.TemporaryDirectory() as temp_dir:
+                sqlite_result = run_scenario(TemporalIntelligenceEngine(
+                    config_path=config_path, db_path=os.path.join(temp_dir, "temporal.db")
+                ))
+            memory_result = run_scenario(TemporalIntelligenceEngine(
+                config_path=config_path, db_path="temporal_parity", backend="memory"
+            ))
+            
+            mismatched = [key for key in sqlite_result if sqlite_result[key] != memory_result[key]]
+            return {
+                "success": (
+                    not mismatched and sqlite_result["logged"] == len(events) + 1 and
+                    len(sqlite_result["rows"]) == len(memory_ids) and
+                    sqlite_result["review_queue"]["forgotten_gems"] == ["parity_gem"] and
+                    sqlite_result["review_queue"]["trending_up"] == ["parity_trending"]
+                ),
+                "mismatched": mismatched,
+                "review_queue": memory_result["review_queue"],
+                "details": "Memory and sqlite backends agree"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_cron_schedule(self) -> Dict[str, Any]:
+        """Test cron next-run calculation edge cases for the temporal daemon"""
+        if not temporal_import_success:
+            return {"success": False, "error": "Temporal engine not available", "skipped": True}
+            
+        try:
+            CronSchedule = temporal_processor.CronSchedule
+            
+            def next_run(expression: str, after: str) -> str:
+                return CronSchedule(expression).next_after(datetime.fromisoformat(after)).isoformat()
+            
+            expected = [
+                # Leap day only fires in leap years
+                ("0 0 29 2 *", "2025-03-01T00:00:00", "2028-02-29T00:00:00"),
+                # Seconds are dropped and the result is strictly after
+                ("*/15 * * * *", "2025-01-01T10:59:30", "2025-01-01T11:00:00"),
+                ("30 23 31 12 *", "2025-12-31T23:30:00", "2026-12-31T23:30:00"),
+                # Day-of-month and weekday both restricted: either matches
+                ("0 0 13 * 5", "2025-06-01T00:00:00", "2025-06-06T00:00:00"),
+                # 7 is Sunday as well as 0
+                ("0 9 * * 7", "2025-06-01T10:00:00", "2025-06-08T09:00:00"),
+                ("0 9 * * 0", "2025-06-01T08:00:00", "2025-06-01T09:00:00"),
+                # Ranges with steps and lists
+                ("0 8-18/5,20 * * 1-5", "2025-06-06T18:30:00", "2025-06-06T20:00:00")
+            ]
+            mismatches = []
+            for expression, after, wanted in expected:
+                actual = next_run(expression, after)
+                if actual != wanted:
+                    mismatches.append((expression, actual, wanted))
+            
+            rejected = 0
+            invalid_expressions = ["60 * * * *", "* * *", "0 0 0 * *", "*/0 * * * *", "5-1 * * * *"]
+            for expression in invalid_expressions:
+                try:
+                    CronSchedule(expression)
+                except ValueError:
+                    rejected += 1
+            
+            try:
+                next_run("0 0 31 2 *", "2025-01-01T00:00:00")
+                never_fires_rejected = False
+            except ValueError:
+                never_fires_rejected = True
+            
+            return {
+                "success": not mismatches and rejected == len(invalid_expressions) and never_fires_rejected,
+                "mismatches": mismatches,
+                "details": f"{len(expected)} schedules checked, {rejected} invalid expressions rejected"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
     async def test_security_audit(self) -> Dict[str, Any]:
         """Test security and audit system"""
         if not audit_import_success:
@@ -405,7 +1270,8 @@ class SystemIntegrationTests:
             )
             
             # Test memory sharing
-            from team.team_memory_manager import ShareScope, AccessLevel
+            ShareScope = team_memory_manager.ShareScope
+            AccessLevel = team_memory_manager.AccessLevel
             
             share_result = team_manager.share_memory(
                 memory_id="test_shared_mem",
@@ -429,6 +1295,249 @@ class SystemIntegrationTests:
         except Exception as e:
             return {"success": False, "error": str(e)}
     
+    async def test_team_acl_invalidation(self) -> Dict[str, Any]:
+        """Test that membership and share changes invalidate the cached ACL"""
+        if not team_import_success:
+            return {"success": False, "error": "Team manager not available", "skipped": True}
+            
+        try:
+            team_manager = TeamMemoryManager(":memory:")
+            ShareScope = team_memory_manager.ShareScope
+            AccessLevel = team_memory_manager.AccessLevel
+            
+            team_id = team_manager.create_team("ACL Team", "Team for ACL tests", "acl_owner")
+            team_manager.share_memory("acl_team_mem", "acl_owner", ShareScope.TEAM, team_id)
+            team_manager.share_memory("acl_private_mem", "acl_owner", ShareScope.PERSONAL)
+            
+            # Both answers come from the same cached snapshot
+            before_join = team_manager.can_access_memory("acl_member", "acl_team_mem")
+            before_public = team_manager.can_access_memory("acl_member", "acl_private_mem")
+            
+            team_manager.add_team_member(team_id, "acl_member", AccessLevel.READ, "acl_owner")
+            after_join = team_manager.can_access_memory("acl_member", "acl_team_mem")
+            
+            team_manager.share_memory("acl_private_mem", "acl_owner", ShareScope.PUBLIC)
+            after_public = team_manager.can_access_memory("acl_member", "acl_private_mem")
+            
+            write_denied = team_manager.can_access_memory("acl_member", "acl_team_mem", AccessLevel.WRITE)
+            team_manager.close()
+            
+            return {
+                "success": (
+                    not before_join and not before_public and
+                    after_join and after_public and not write_denied
+                ),
+                "details": "ACL cache follows membership and share changes"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_team_share_sweeper(self) -> Dict[str, Any]:
+        """Test that sweeping an expired share revokes it but keeps owner access"""
+        if not team_import_success:
+            return {"success": False, "error": "Team manager not available", "skipped": True}
+            
+        try:
+            team_manager = TeamMemoryManager(":memory:")
+            ShareScope = team_memory_manager.ShareScope
+            AccessLevel = team_memory_manager.AccessLevel
+            
+            team_id = team_manager.create_team("Sweep Team", "Team for sweeper tests", "sweep_owner")
+            team_manager.add_team_member(team_id, "sweep_member", AccessLevel.READ, "sweep_owner")
+            team_manager.share_memory("sweep_mem", "sweep_owner", ShareScope.TEAM, team_id, expires_hours=1)
+            shared_before = team_manager.can_access_memory("sweep_member", "sweep_mem")
+            
+            with team_manager.db.writer() as conn:
+                conn.execute(
+                    "UPDATE memory_sharing SET expires_timestamp = ? WHERE memory_id = ?",
+                    ("2000-01-01T00:00:00", "sweep_mem")
+                )
+            team_manager.invalidate_acl()
+            
+            sweep_result = team_manager.sweep_expired_shares()
+            
+            with team_manager.db.reader() as conn:
+                remaining = conn.execute(
+                    "SELECT share_scope, team_id, expires_timestamp FROM memory_sharing WHERE memory_id = ?",
+                    ("sweep_mem",)
+                ).fetchall()
+                archived = conn.execute(
+                    "SELECT COUNT(*) FROM memory_sharing_archive WHERE memory_id = ?", ("sweep_mem",)
+                ).fetchone()[0]
+            
+            owner_access = team_manager.can_access_memory("sweep_owner", "sweep_mem")
+            member_access = team_manager.can_access_memory("sweep_member", "sweep_mem")
+            team_manager.close()
+            
+            return {
+                "success": (
+                    shared_before and sweep_result["swept_shares"] == 1 and
+                    remaining == [(ShareScope.PERSONAL.value, None, None)] and archived == 1 and
+                    owner_access and not member_access
+                ),
+                "swept_shares": sweep_result["swept_shares"],
+                "details": "Expired share revoked, owner access kept"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_team_access_log_flush(self) -> Dict[str, Any]:
+        """Test that buffered team access events are all written on close"""
+        if not team_import_success:
+            return {"success": False, "error": "Team manager not available", "skipped": True}
+            
+        try:
+            with tempfile.TemporaryDirectory() as temp_dir:
+                db_path = os.path.join(temp_dir, "team.db")
+                event_count = 500
+                
+                team_manager = TeamMemoryManager(db_path)
+                buffered = team_manager.access_logger is not None
+                for i in range(event_count):
+                    team_manager.log_team_access(
+                        f"flush_mem_{i % 10}", "flush_user", None, "view",
+                        {"query": "x" * (i % 300)} if i % 2 else None
+                    )
+                team_manager.close()
+                
+                reopened = TeamMemoryManager(db_path)
+                with reopened.db.reader() as conn:
+                    stored, with_metadata = conn.execute(
+                        "SELECT COUNT(*), COUNT(metadata) FROM team_access_log WHERE user_id = ?",
+                        ("flush_user",)
+                    ).fetchone()
+                reopened.close()
+            
+            return {
+                "success": buffered and stored == event_count and with_metadata == event_count // 2,
+                "events_logged": event_count,
+                "events_stored": stored,
+                "details": "Buffered access log drained on close"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_team_search_isolation(self) -> Dict[str, Any]:
+        """Test that team-mode CLI search hides other users' personal memories"""
+        if not (cli_import_success and team_import_success):
+            return {"success": False, "error": "Memory CLI or team manager not available", "skipped": True}
+            
+        try:
+            ShareScope = team_memory_manager.ShareScope
+            AccessLevel = team_memory_manager.AccessLevel
+            
+            graph_service = MemoryGraphService(":memory:")
+            team_manager = TeamMemoryManager(":memory:")
+            temporal_engine = TemporalIntelligenceEngine(db_path=":memory:")
+            
+            team_id = team_manager.create_team("Search Team", "Team for search tests", "search_alice")
+            team_manager.add_team_member(team_id, "search_bob", AccessLevel.READ, "search_alice")
+            for memory_id, owner, scope in [
+                ("search_alice_private", "search_alice", ShareScope.PERSONAL),
+                ("search_bob_private", "search_bob", ShareScope.PERSONAL),
+                ("search_team_note", "search_alice", ShareScope.TEAM)
+            ]:
+                graph_service.add_memory_node(memory_id, f"roadmap notes {memory_id}",
+                                              "knowledge_technical", ["search"])
+                team_manager.share_memory(memory_id, owner, scope,
+                                          team_id if scope == ShareScope.TEAM else None)
+            
+            def search_as(user_id: str) -> set:
+                # Only the search dependencies; the audit and validator stores are not needed
+                cli = MemoryCLI.__new__(MemoryCLI)
+                cli.user_id = user_id
+                cli.team_manager = team_manager
+                cli.graph_service = graph_service
+                cli.temporal_engine = temporal_engine
+                result = cli.search_memories("roadmap")
+                return {hit["memory_id"] for hit in result.get("results", [])}
+            
+            alice_hits = search_as("search_alice")
+            bob_hits = search_as("search_bob")
+            outsider_hits = search_as("search_carol")
+            
+            temporal_engine.close()
+            team_manager.close()
+            graph_service.close()
+            
+            return {
+                "success": (
+                    alice_hits == {"search_alice_private", "search_team_note"} and
+                    bob_hits == {"search_bob_private", "search_team_note"} and
+                    not outsider_hits
+                ),
+                "alice_hits": sorted(alice_hits),
+                "bob_hits": sorted(bob_hits),
+                "details": "Search results filtered by team permissions"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
+    async def test_team_accessible_pagination(self) -> Dict[str, Any]:
+        """Test keyset paging over owned, team and public shares returns each row once"""
+        if not team_import_success:
+            return {"success": False, "error": "Team manager not available", "skipped": True}
+            
+        try:
+            team_manager = TeamMemoryManager(":memory:")
+            ShareScope = team_memory_manager.ShareScope
+            AccessLevel = team_memory_manager.AccessLevel
+            
+            team_id = team_manager.create_team("Paging Team", "Team for paging tests", "page_owner")
+            other_team_id = team_manager.create_team("Other Team", "Not joined", "page_owner")
+            team_manager.add_team_member(team_id, "page_user", AccessLevel.READ, "page_owner")
+            
+            # Interleave every kind of share so each page mixes all three UNION ALL branches
+            expected = set()
+            for i in range(40):
+                kind = i % 5
+                memory_id = f"page_mem_{i}"
+                if kind == 0:
+                    team_manager.share_memory(memory_id, "page_user", ShareScope.PERSONAL)
+                    expected.add(memory_id)
+                elif kind == 1:
+                    team_manager.share_memory(memory_id, "page_owner", ShareScope.TEAM, team_id)
+                    expected.add(memory_id)
+                elif kind == 2:
+                    team_manager.share_memory(memory_id, "page_owner", ShareScope.PUBLIC)
+                    expected.add(memory_id)
+                elif kind == 3:
+                    team_manager.share_memory(memory_id, "page_owner", ShareScope.PERSONAL)
+                else:
+                    team_manager.share_memory(memory_id, "page_owner", ShareScope.TEAM, other_team_id)
+            
+            streamed = list(team_manager.iter_accessible_memories("page_user", team_id, page_size=7))
+            share_ids = [entry["share_id"] for entry in streamed]
+            
+            paged = []
+            after_id = 0
+            while True:
+                page = team_manager.get_accessible_memories("page_user", team_id, limit=5, after_id=after_id)
+                paged.extend(page)
+                if len(page) < 5:
+                    break
+                after_id = page[-1]["share_id"]
+            team_manager.close()
+            
+            streamed_ids = [entry["memory_id"] for entry in streamed]
+            return {
+                "success": (
+                    len(streamed_ids) == len(set(streamed_ids)) == len(expected) and
+                    set(streamed_ids) == expected and
+                    share_ids == sorted(share_ids) and
+                    [entry["memory_id"] for entry in paged] == streamed_ids
+                ),
+                "accessible": len(streamed_ids),
+                "details": "Keyset pages cover every accessible share exactly once"
+            }
+            
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
     async def test_langflow_integration(self) -> Dict[str, Any]:
         """Test LangFlow integration (basic connectivity)"""
         if not langflow_import_success:
@@ -542,7 +1651,7 @@ async def main():
     results = await test_suite.run_all_tests()
     
     # Save results
-    results_file = f"/Users/josephhillin/workspace/mcp-central/integration-test-results.json"
+    results_file = os.path.join(MCP_ROOT, "integration-test-results.json")
     with open(results_file, 'w') as f:
         json.dump(results, f, indent=2)
     
@@ -16,12 +16,23 @@ from typing import Dict, List, Any, Optional
 import logging
 import time
 import psutil
+from importlib.util import spec_from_file_location, module_from_spec
+
+MCP_ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(MCP_ROOT)
+
+def load_module(name: str, relative_path: str):
+    """Import a component script by path (the file names are hyphenated)"""
+    spec = spec_from_file_location(name, os.path.join(MCP_ROOT, relative_path))
+    module = module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
 
 # Import local components
-sys.path.append('/Users/josephhillin/workspace/mcp-central')
-from langflow.memory_mcp_bridge import LangFlowMCPBridge
-from raycast_config_registry import RaycastConfigRegistry
-from team.team_memory_manager import TeamMemoryManager
+LangFlowMCPBridge = load_module("memory_mcp_bridge", "langflow/memory-mcp-bridge.py").LangFlowMCPBridge
+RaycastConfigRegistry = load_module("raycast_config_registry", "raycast-config-registry.py").RaycastConfigRegistry
+TeamMemoryManager = load_module("team_memory_manager", "team/team-memory-manager.py").TeamMemoryManager
 
 class CrossAgentMemoryOrchestrator:
     def __init__(self):
@@ -29,6 +40,7 @@ class CrossAgentMemoryOrchestrator:
         self.running_processes = {}
         self.health_checks = {}
         self.startup_sequence = []
+        self.team_manager = None
         
         # Initialize logging
         logging.basicConfig(
@@ -85,6 +97,10 @@ class CrossAgentMemoryOrchestrator:
                     "enabled": True,
                     "schedule": "*/5 * * * *",  # Every 5 minutes
                     "script": f"{self.base_path}/agents/temporal-engine/temporal-processor.py"
+                },
+                "team_share_sweeper": {
+                    "enabled": True,
+                    "interval_seconds": 300
                 }
             }
         }
@@ -136,6 +152,9 @@ class CrossAgentMemoryOrchestrator:
             # 4. Start health monitoring
             asyncio.create_task(self.health_monitor_loop())
             
+            # 5. Sweep expired team shares for as long as the orchestrator runs
+            self.start_team_share_sweeper()
+            
             self.logger.info("🎉 Cross-Agent Memory Intelligence System fully operational!")
             
             return {
@@ -252,12 +271,14 @@ class CrossAgentMemoryOrchestrator:
         """Start memory graph API service"""
         script_path = f"{self.base_path}/graph/memory-graph-service.py"
         
-        cmd = ["python3", script_path, "--api-mode", "--port", "8767"]
+        cmd = ["python3", script_path, "--api-mode", "--port", "8767",
+               "--log-file", f"{self.base_path}/memory-graph-api.log"]
         
+        # Nothing reads the server's output; a full pipe would block it
         process = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
         )
         
         self.running_processes["memory_graph_api"] = process.pid
@@ -266,12 +287,13 @@ class CrossAgentMemoryOrchestrator:
         """Start temporal processor as background service"""
         script_path = f"{self.base_path}/agents/temporal-engine/temporal-processor.py"
         
-        cmd = ["python3", script_path, "--daemon"]
+        cmd = ["python3", script_path, "--daemon", "--log-file", f"{self.base_path}/temporal-processor.log"]
         
+        # Nothing reads the daemon's output; a full pipe would block it
         process = await asyncio.create_subprocess_exec(
             *cmd,
-            stdout=asyncio.subprocess.PIPE,
-            stderr=asyncio.subprocess.PIPE
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL
         )
         
         self.running_processes["temporal_processor"] = process.pid
@@ -291,6 +313,16 @@ class CrossAgentMemoryOrchestrator:
         
         await process.communicate()
     
+    def start_team_share_sweeper(self):
+        """Run the team manager's expired-share sweeper in this process"""
+        sweeper_config = self.config.get("services", {}).get("team_share_sweeper", {})
+        if not sweeper_config.get("enabled", True):
+            return
+        
+        self.team_manager = TeamMemoryManager(f"{self.base_path}/team/team-memory.db")
+        self.team_manager.start_share_sweeper(interval_seconds=sweeper_config.get("interval_seconds", 300))
+        self.logger.info("Team share sweeper started")
+    
     async def sync_raycast_configs(self):
         """Sync configurations to Raycast"""
         sync_result = self.registry.sync_to_raycast()
@@ -378,6 +410,11 @@ class CrossAgentMemoryOrchestrator:
             except Exception as e:
                 self.logger.error(f"Error stopping {service_name}: {e}")
         
+        # Stop the share sweeper and release the team database
+        if self.team_manager:
+            self.team_manager.close()
+            self.team_manager = None
+        
         # Stop Docker services
         compose_file = f"{self.base_path}/docker-compose.yaml"
         if os.path.exists(compose_file):
@@ -0,0 +1,2 @@
+# Storage Package
+# Shared SQLite and Postgres connection management
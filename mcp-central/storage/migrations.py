@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Schema Migrations
+Versioned, idempotent schema upgrades for the SQLite-backed memory services
+"""
+
+import sqlite3
+from datetime import datetime
+from typing import Callable, List, Tuple, Union
+
+# A migration step is either a SQL statement or a callable taking a cursor
+MigrationStep = Union[str, Callable[[sqlite3.Cursor], None]]
+Migration = Tuple[int, List[MigrationStep]]
+
+def current_schema_version(conn: sqlite3.Connection, component: str) -> int:
+    """Return the highest applied migration version for a component"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_migrations (
+            component TEXT,
+            version INTEGER,
+            applied_timestamp TEXT,
+            PRIMARY KEY (component, version)
+        )
+    ''')
+
+    row = conn.execute('''
+        SELECT MAX(version) FROM schema_migrations WHERE component = ?
+    ''', (component,)).fetchone()
+
+    return row[0] or 0
+
+def apply_migrations(conn: sqlite3.Connection, component: str,
+                     migrations: List[Migration]) -> int:
+    """Apply every migration newer than the recorded version, in order.
+
+    Must be called inside a write transaction so that a failing step leaves
+    the schema at its previous version. Versions are tracked per component,
+    so several services can share one database file.
+    """
+    version = current_schema_version(conn, component)
+    cursor = conn.cursor()
+
+    for target_version, steps in sorted(migrations, key=lambda m: m[0]):
+        if target_version <= version:
+            continue
+
+        for step in steps:
+            if callable(step):
+                step(cursor)
+            else:
+                cursor.execute(step)
+
+        cursor.execute('''
+            INSERT INTO schema_migrations (component, version, applied_timestamp)
+            VALUES (?, ?, ?)
+        ''', (component, target_version, datetime.now().isoformat()))
+        version = target_version
+
+    return version
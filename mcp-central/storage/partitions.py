@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Table Partitions
+Time-bucketed archive tables (``<base>_YYYYMM`` / ``<base>_YYYYMMDD``) for
+append-only logs on SQLite or Postgres (ISO-8601 TEXT timestamps)
+"""
+
+import re
+import sqlite3
+from datetime import date, timedelta
+from typing import List, Tuple
+
+GRANULARITIES = ("monthly", "daily")
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+def _check_identifier(name: str) -> str:
+    """Table and column names are interpolated into SQL, so only allow plain identifiers"""
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"Invalid SQL identifier: {name!r}")
+    return name
+
+def partition_key(day: date, granularity: str) -> str:
+    """Partition suffix for a calendar day"""
+    if granularity == "monthly":
+        return day.strftime("%Y%m")
+    if granularity == "daily":
+        return day.strftime("%Y%m%d")
+    raise ValueError(f"Unknown partition granularity: {granularity}")
+
+def partition_bounds(key: str) -> Tuple[str, str]:
+    """ISO timestamp range ``[start, end)`` covered by a partition key"""
+    if len(key) == 6:
+        year, month = int(key[:4]), int(key[4:])
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1)
+    else:
+        start = date(int(key[:4]), int(key[4:6]), int(key[6:]))
+        end = start + timedelta(days=1)
+    return start.isoformat(), end.isoformat()
+
+def _table_names(conn) -> List[str]:
+    if isinstance(conn, sqlite3.Connection):
+        return [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+    return [row[0] for row in conn.execute('''
+        SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()
+    ''')]
+
+def list_partitions(conn, base_table: str) -> List[Tuple[str, str]]:
+    """``(key, table_name)`` for every partition of a table, oldest first"""
+    _check_identifier(base_table)
+    pattern = re.compile(rf'^{base_table}_(\d{{6}}|\d{{8}})$')
+
+    partitions = []
+    for name in _table_names(conn):
+        match = pattern.match(name)
+        if match:
+            partitions.append((match.group(1), name))
+
+    return sorted(partitions)
+
+def archive_rows(conn, base_table: str, timestamp_column: str,
+                 cutoff: str, granularity: str = "monthly") -> int:
+    """Move rows with ``timestamp_column < cutoff`` into per-period partitions.
+
+    Partitions are created on demand with the base table's columns. Must run
+    inside a write transaction so each row ends up in exactly one table.
+    """
+    _check_identifier(base_table)
+    _check_identifier(timestamp_column)
+    partition_key(date.today(), granularity)  # validate before touching data
+
+    key_length = 7 if granularity == "monthly" else 10
+    periods = [row[0] for row in conn.execute(f'''
+        SELECT DISTINCT substr({timestamp_column}, 1, {key_length}) FROM {base_table}
+        WHERE {timestamp_column} < ?
+    ''', (cutoff,))]
+
+    moved = 0
+    for period in periods:
+        key = period.replace('-', '')
+        if not key.isdigit():
+            continue
+        start, end = partition_bounds(key)
+        end = min(end, cutoff)
+        partition = f"{base_table}_{key}"
+
+        conn.execute(f'CREATE TABLE IF NOT EXISTS {partition} AS SELECT * FROM {base_table} WHERE 1 = 0')
+        conn.execute(f'''
+            INSERT INTO {partition} SELECT * FROM {base_table}
+            WHERE {timestamp_column} >= ? AND {timestamp_column} < ?
+        ''', (start, end))
+        moved += conn.execute(f'''
+            DELETE FROM {base_table}
+            WHERE {timestamp_column} >= ? AND {timestamp_column} < ?
+        ''', (start, end)).rowcount
+
+    return moved
+
+def drop_partitions_before(conn, base_table: str, oldest_kept: date) -> List[str]:
+    """Drop partitions whose whole period ends on or before ``oldest_kept``"""
+    dropped = []
+    for key, name in list_partitions(conn, base_table):
+        _, end = partition_bounds(key)
+        if end <= oldest_kept.isoformat():
+            conn.execute(f'DROP TABLE {name}')
+            dropped.append(name)
+    return dropped
+
+def archive_before(db, base_table: str, timestamp_column: str, cutoff: str,
+                   granularity: str = "monthly") -> int:
+    """Archive every row older than ``cutoff``, one period per write transaction.
+
+    ``db`` is a connection manager with a ``writer()`` context. Working from
+    the oldest period forward keeps each writer lock hold short.
+    """
+    _check_identifier(base_table)
+    _check_identifier(timestamp_column)
+
+    archived_rows = 0
+    while True:
+        with db.writer() as conn:
+            oldest = conn.execute(f'''
+                SELECT MIN({timestamp_column}) FROM {base_table} WHERE {timestamp_column} < ?
+            ''', (cutoff,)).fetchone()[0]
+            try:
+                oldest_day = date.fromisoformat(oldest[:10])
+            except (TypeError, ValueError):
+                return archived_rows
+
+            _, period_end = partition_bounds(partition_key(oldest_day, granularity))
+            moved = archive_rows(conn, base_table, timestamp_column, min(period_end, cutoff), granularity)
+        if not moved:
+            return archived_rows
+        archived_rows += moved
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Postgres Connection Manager
+asyncpg connection pool behind the same writer()/reader() interface as
+SQLiteConnectionManager, so SQLite-backed services can run against Postgres
+"""
+
+import asyncio
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+try:
+    import asyncpg
+    ASYNCPG_AVAILABLE = True
+except ImportError:
+    ASYNCPG_AVAILABLE = False
+
+_ROW_STATEMENTS = ("SELECT", "WITH", "VALUES")
+
+def translate_placeholders(sql: str) -> str:
+    """Rewrite sqlite3 ``?`` placeholders as ``$1``, ``$2``... outside string literals"""
+    parts = sql.split("'")
+    count = 0
+    for i in range(0, len(parts), 2):
+        pieces = parts[i].split('?')
+        rebuilt = [pieces[0]]
+        for piece in pieces[1:]:
+            count += 1
+            rebuilt.append(f"${count}{piece}")
+        parts[i] = ''.join(rebuilt)
+    return "'".join(parts)
+
+class PostgresCursor:
+    """The subset of the sqlite3 cursor API the memory services use"""
+
+    def __init__(self, connection: "PostgresConnection"):
+        self.connection = connection
+        self.rowcount = -1
+        self._rows: List[tuple] = []
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> "PostgresCursor":
+        self._rows, self.rowcount = self.connection.manager.run(
+            self.connection._execute(sql, tuple(params))
+        )
+        return self
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> "PostgresCursor":
+        self.connection.manager.run(self.connection._executemany(sql, [tuple(p) for p in seq_of_params]))
+        self._rows, self.rowcount = [], -1
+        return self
+
+    def fetchone(self) -> Optional[tuple]:
+        return self._rows.pop(0) if self._rows else None
+
+    def fetchall(self) -> List[tuple]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def __iter__(self):
+        return iter(self.fetchall())
+
+class PostgresConnection:
+    """Synchronous facade over one pooled asyncpg connection"""
+
+    def __init__(self, manager: "PostgresConnectionManager", raw):
+        self.manager = manager
+        self.raw = raw
+
+    def cursor(self) -> PostgresCursor:
+        return PostgresCursor(self)
+
+    def execute(self, sql: str, params: Sequence[Any] = ()) -> PostgresCursor:
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql: str, seq_of_params: Iterable[Sequence[Any]]) -> PostgresCursor:
+        return self.cursor().executemany(sql, seq_of_params)
+
+    async def _execute(self, sql: str, params: tuple):
+        statement = self.manager.statement(sql)
+        if statement.lstrip().upper().startswith(_ROW_STATEMENTS) or "RETURNING" in statement.upper():
+            rows = await self.raw.fetch(statement, *params)
+            return [tuple(row) for row in rows], len(rows)
+
+        status = await self.raw.execute(statement, *params)
+        # Status is e.g. "UPDATE 3" or "INSERT 0 1"; the last field is the row count
+        count = status.rsplit(' ', 1)[-1]
+        return [], int(count) if count.isdigit() else -1
+
+    async def _executemany(self, sql: str, params: List[tuple]):
+        if params:
+            await self.raw.executemany(self.manager.statement(sql), params)
+
+class PostgresConnectionManager:
+    """Pooled asyncpg connections driven from synchronous code.
+
+    The pool lives on a private event loop thread. ``writer()`` checks out a
+    connection inside a transaction, committed on success; ``reader()``
+    checks one out in autocommit mode. Unlike SQLite, Postgres handles
+    concurrent writers itself, so writers are not serialized here. Async
+    callers can use ``pool`` directly on ``loop``.
+    """
+
+    dialect = "postgres"
+
+    def __init__(self, dsn: str, pool_size: int = 4, timeout: float = 30.0,
+                 server_settings: Dict[str, str] = None):
+        if not ASYNCPG_AVAILABLE:
+            raise ImportError("The Postgres backend requires asyncpg")
+
+        self.dsn = dsn
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self._statements: Dict[str, str] = {}
+        self._local = threading.local()
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="postgres-pool", daemon=True)
+        self._thread.start()
+
+        async def create_pool():
+            return await asyncpg.create_pool(
+                dsn, min_size=1, max_size=self.pool_size,
+                command_timeout=timeout, server_settings=server_settings
+            )
+
+        try:
+            self.pool = self.run(create_pool())
+        except BaseException:
+            self._stop_loop()
+            raise
+
+    def run(self, coroutine):
+        """Run a coroutine on the pool's event loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _acquire(self):
+        return await self.pool.acquire(timeout=self.timeout)
+
+    def statement(self, sql: str) -> str:
+        """Postgres form of a sqlite3-style statement (cached)"""
+        statement = self._statements.get(sql)
+        if statement is None:
+            statement = self._statements[sql] = translate_placeholders(sql)
+        return statement
+
+    @contextmanager
+    def writer(self) -> Iterator[PostgresConnection]:
+        """Write transaction on a pooled connection, committed on success"""
+        # Nested use from the same thread joins the outer transaction
+        current = getattr(self._local, "writer", None)
+        if current is not None:
+            yield current
+            return
+
+        raw = self.run(self._acquire())
+        transaction = raw.transaction()
+        try:
+            self.run(transaction.start())
+            conn = self._local.writer = PostgresConnection(self, raw)
+            try:
+                yield conn
+            except BaseException:
+                self.run(transaction.rollback())
+                raise
+            else:
+                self.run(transaction.commit())
+            finally:
+                self._local.writer = None
+        finally:
+            self.run(self.pool.release(raw))
+
+    @contextmanager
+    def reader(self) -> Iterator[PostgresConnection]:
+        """Borrow a pooled connection for reads"""
+        current = getattr(self._local, "writer", None)
+        if current is not None:
+            yield current
+            return
+
+        raw = self.run(self._acquire())
+        try:
+            yield PostgresConnection(self, raw)
+        finally:
+            self.run(self.pool.release(raw))
+
+    def _stop_loop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=self.timeout)
+        self.loop.close()
+
+    def close(self):
+        """Close the pool and stop its event loop"""
+        try:
+            self.run(self.pool.close())
+        finally:
+            self._stop_loop()
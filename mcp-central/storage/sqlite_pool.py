@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+SQLite Connection Manager
+Long-lived WAL-mode connections shared by the SQLite-backed memory services
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator
+
+# Tuned for many concurrent readers and one writer on local disk
+DEFAULT_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "temp_store": "MEMORY",
+    "cache_size": -16000,      # ~16MB page cache per connection
+    "mmap_size": 268435456,    # 256MB memory-mapped I/O
+    "busy_timeout": 5000       # ms
+}
+
+def shared_memory_uri(name: str) -> str:
+    """URI of a named in-memory database shared between connections"""
+    return f"file:{name}?mode=memory&cache=shared"
+
+@contextmanager
+def read_snapshot(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """Run several SELECTs against one consistent snapshot.
+
+    Connections are in autocommit mode, so each statement otherwise sees the
+    latest commit. A deferred ``BEGIN`` pins the WAL snapshot at the first
+    read until ``COMMIT``. Inside an open transaction this is a no-op.
+    """
+    if conn.in_transaction:
+        yield conn
+        return
+
+    conn.execute("BEGIN")
+    try:
+        yield conn
+    finally:
+        conn.execute("COMMIT")
+
+class SQLiteConnectionManager:
+    """Pool of reader connections plus a single serialized writer.
+
+    Writes go through ``writer()``, which holds a lock for the duration of one
+    ``BEGIN IMMEDIATE`` ... ``COMMIT`` transaction. Reads go through
+    ``reader()``, which borrows a connection from a bounded pool. In WAL mode
+    readers never block the writer and vice versa.
+
+    ``":memory:"`` databases only exist for the lifetime of one connection, so
+    in that case readers and the writer share a single connection. A named
+    in-memory URI (see ``shared_memory_uri``) is shared by every manager
+    opened on that name in this process, and lives until the last one closes.
+    """
+
+    dialect = "sqlite"
+
+    def __init__(self, db_path: str, pool_size: int = 4,
+                 pragmas: Dict[str, Any] = None, timeout: float = 30.0):
+        self.db_path = db_path
+        self.pool_size = max(1, pool_size)
+        self.timeout = timeout
+        self.pragmas = dict(DEFAULT_PRAGMAS)
+        self.pragmas.update(pragmas or {})
+        self.in_memory = db_path == ":memory:" or db_path == "" or "mode=memory" in db_path
+
+        self._write_lock = threading.RLock()
+        self._readers = queue.LifoQueue(maxsize=self.pool_size)
+        self._reader_count = 0
+        self._pool_lock = threading.Lock()
+        self._closed = False
+
+        self._writer = self._connect(read_only=False)
+
+    def _connect(self, read_only: bool) -> sqlite3.Connection:
+        """Open a connection in autocommit mode with the configured pragmas"""
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False,
+                               isolation_level=None, uri=self.db_path.startswith("file:"))
+
+        for name, value in self.pragmas.items():
+            # journal_mode is persistent per database file; set it once
+            if name == "journal_mode" and (read_only or self.in_memory):
+                continue
+            conn.execute(f"PRAGMA {name} = {value}")
+
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+
+        return conn
+
+    @contextmanager
+    def writer(self) -> Iterator[sqlite3.Connection]:
+        """Serialized write transaction, committed on success"""
+        with self._write_lock:
+            conn = self._writer
+
+            # Nested use from the same thread joins the outer transaction
+            if conn.in_transaction:
+                yield conn
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            else:
+                conn.execute("COMMIT")
+
+    @contextmanager
+    def reader(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection from the pool"""
+        if self.in_memory:
+            with self._write_lock:
+                yield self._writer
+            return
+
+        conn = self._acquire_reader()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self._readers.put(conn)
+
+    @contextmanager
+    def dedicated_reader(self) -> Iterator[sqlite3.Connection]:
+        """A read-only connection of its own, for long-running streams.
+
+        Holding a pooled reader for the length of a slow download would starve
+        every other reader, so this one is opened for the caller and closed
+        afterwards. A plain ``":memory:"`` database only has the writer
+        connection, so there it falls back to ``reader()``.
+        """
+        if self.db_path in (":memory:", ""):
+            with self.reader() as conn:
+                yield conn
+            return
+
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection manager is closed")
+
+        conn = self._connect(read_only=True)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _acquire_reader(self) -> sqlite3.Connection:
+        """Reuse an idle reader, open a new one, or wait for one to free up"""
+        if self._closed:
+            raise sqlite3.ProgrammingError("Connection manager is closed")
+
+        try:
+            return self._readers.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._pool_lock:
+            if self._reader_count < self.pool_size:
+                self._reader_count += 1
+                return self._connect(read_only=True)
+
+        try:
+            return self._readers.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"No reader connection available after {self.timeout}s "
+                f"(pool_size={self.pool_size})"
+            )
+
+    def close(self):
+        """Close every pooled connection"""
+        self._closed = True
+
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
+        with self._write_lock:
+            self._writer.close()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Write-Behind Queue
+Bounded in-process buffer drained in batches by a background writer thread,
+for hot-path logging that should not pay for a commit per event
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, List
+
+logger = logging.getLogger(__name__)
+
+class WriteBehindQueue:
+    """Queue items now, write them in batches on a background thread.
+
+    ``put`` only enqueues; the writer thread hands queued items to
+    ``write_batch`` once ``batch_size`` are waiting or ``flush_interval``
+    seconds have passed. When ``max_pending`` items are queued, ``put`` blocks
+    until the writer catches up, so nothing is dropped. A failing batch is
+    retried up to ``attempts`` times in total before it is counted as failed.
+
+    ``close`` drains everything still queued before returning, and is also
+    registered with ``atexit`` so short-lived processes that never call it
+    still write out their backlog.
+    """
+
+    _STOP = object()
+
+    def __init__(self, write_batch: Callable[[List[Any]], Any], max_pending: int,
+                 batch_size: int, flush_interval: float, name: str = "write-behind",
+                 attempts: int = 1):
+        self.write_batch = write_batch
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.name = name
+        self.attempts = max(1, attempts)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._closed = False
+        self.stats = {'queued': 0, 'written': 0, 'batches': 0, 'retries': 0, 'failed': 0}
+
+        self._writer = threading.Thread(target=self._run, name=name, daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def put(self, item: Any, timeout: float = None):
+        """Queue an item, blocking while the buffer is full"""
+        if self._closed:
+            raise RuntimeError(f"{self.name} is closed")
+
+        self._queue.put(item, timeout=timeout)
+        self.stats['queued'] += 1
+
+    def flush(self):
+        """Block until every item queued so far has been written"""
+        self._queue.join()
+
+    def close(self):
+        """Stop accepting items, write out the backlog and stop the writer"""
+        if self._closed:
+            return
+        self._closed = True
+        atexit.unregister(self.close)
+        self._queue.put(self._STOP)
+        self._writer.join()
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is self._STOP:
+                self._queue.task_done()
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is self._STOP:
+                    self._queue.task_done()
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._write(batch)
+
+        # Items that raced with close() land behind the stop marker
+        leftovers = []
+        while True:
+            try:
+                leftovers.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        self._write(leftovers)
+
+    def _write(self, batch: List[Any]):
+        if not batch:
+            return
+        try:
+            for attempt in range(1, self.attempts + 1):
+                try:
+                    self.write_batch(batch)
+                except Exception:
+                    if attempt == self.attempts:
+                        self.stats['failed'] += len(batch)
+                        logger.exception("%s: failed to write %d items", self.name, len(batch))
+                        return
+                    self.stats['retries'] += 1
+                    time.sleep(0.1 * attempt)
+                else:
+                    self.stats['written'] += len(batch)
+                    self.stats['batches'] += 1
+                    return
+        finally:
+            for _ in batch:
+                self._queue.task_done()
@@ -5,14 +5,82 @@ Enables secure multi-user memory sharing with access controls and collaboration
 """
 
 import json
-import sqlite3
 import hashlib
+import logging
+import sys
+import threading
+import time
+import zlib
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Set
+from typing import Dict, List, Any, Optional, Set, Iterable, Iterator
 import uuid
 from enum import Enum
 import os
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.sqlite_pool import SQLiteConnectionManager
+from storage.migrations import apply_migrations
+from storage.partitions import archive_before, drop_partitions_before
+from storage.write_behind import WriteBehindQueue
+
+logger = logging.getLogger(__name__)
+
+# Expired-share sweeper defaults
+SHARE_SWEEP_INTERVAL_SECONDS = 300
+SHARE_SWEEP_BATCH_SIZE = 1000
+
+# Write-behind team_access_log defaults
+ACCESS_LOG_BUFFER_SIZE = 10000
+ACCESS_LOG_BATCH_SIZE = 500
+ACCESS_LOG_FLUSH_INTERVAL_SECONDS = 1.0
+ACCESS_LOG_WRITE_ATTEMPTS = 3
+# Metadata at least this large is zlib-compressed when that makes it smaller
+METADATA_COMPRESS_THRESHOLD = 256
+
+# team_access_log rows older than this move into daily team_access_log_YYYYMMDD
+# partitions. The audit trail is kept in full by default; a retention period
+# >= 0 drops partitions older than that many days.
+ACCESS_LOG_HOT_DAYS = 30
+ACCESS_LOG_PARTITION_RETENTION_DAYS = -1
+
+INSERT_TEAM_ACCESS_LOG_SQL = '''
+    INSERT INTO team_access_log (memory_id, user_id, team_id, action, timestamp, metadata)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# A cached ACL snapshot is rebuilt after this long even without local changes,
+# so writes made by other processes show up
+ACL_CACHE_MAX_AGE_SECONDS = 30
+
+# Rows per keyset page when streaming accessible memories
+ACCESSIBLE_PAGE_SIZE = 1000
+
+# Owned shares, team shares (when the user is a member of the team) and public
+# shares in one statement. Each branch seeks an index whose equality columns are
+# followed by the implicit rowid (owner, team/scope, scope), so it reads rows from
+# :after_id in id order. The compound ORDER BY merges the three streams without
+# a temp b-tree sort and LIMIT stops after one page.
+ACCESSIBLE_MEMORIES_SQL = '''
+    SELECT id, memory_id, share_scope, access_level, shared_timestamp, owner_user_id, 'owner'
+    FROM memory_sharing
+    WHERE owner_user_id = :user_id AND id > :after_id
+    UNION ALL
+    SELECT id, memory_id, share_scope, access_level, shared_timestamp, owner_user_id, 'team_shared'
+    FROM memory_sharing
+    WHERE team_id = :team_id AND share_scope = 'team' AND id > :after_id
+    AND (expires_timestamp IS NULL OR expires_timestamp > :now)
+    AND owner_user_id IS NOT :user_id
+    AND EXISTS (SELECT 1 FROM team_members WHERE team_id = :team_id AND user_id = :user_id)
+    UNION ALL
+    SELECT id, memory_id, share_scope, access_level, shared_timestamp, owner_user_id, 'public'
+    FROM memory_sharing
+    WHERE share_scope = 'public' AND id > :after_id
+    AND (expires_timestamp IS NULL OR expires_timestamp > :now)
+    AND owner_user_id IS NOT :user_id
+    ORDER BY 1
+    LIMIT :limit
+'''
+
 class AccessLevel(Enum):
     READ = "read"
     WRITE = "write"
@@ -25,16 +93,245 @@ class ShareScope(Enum):
     ORGANIZATION = "organization"
     PUBLIC = "public"
 
+ACCESS_LEVEL_RANK = {
+    AccessLevel.READ: 1,
+    AccessLevel.WRITE: 2,
+    AccessLevel.ADMIN: 3,
+    AccessLevel.OWNER: 4
+}
+_ACCESS_LEVEL_RANK_BY_VALUE = {level.value: rank for level, rank in ACCESS_LEVEL_RANK.items()}
+
+class TeamACLCache:
+    """Membership and share-grant snapshot for permission checks without DB round trips.
+    
+    Holds user -> team ids, memory -> owners and memory -> active team/public
+    grants as ``(team_id, level_rank, expires_at)`` tuples, where
+    ``expires_at`` is an epoch time or None. Grants that expire while the
+    snapshot is alive are skipped at check time.
+    """
+    
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.built_at = time.monotonic()
+        self.memberships: Dict[str, Set[str]] = {}
+        self.owners: Dict[str, Set[str]] = {}
+        self.grants: Dict[str, List[tuple]] = {}
+    
+    @classmethod
+    def load(cls, conn, generation: int) -> "TeamACLCache":
+        cache = cls(generation)
+        
+        for team_id, user_id in conn.execute('SELECT team_id, user_id FROM team_members'):
+            cache.memberships.setdefault(user_id, set()).add(team_id)
+        
+        now = datetime.now().isoformat()
+        rows = conn.execute('''
+            SELECT memory_id, owner_user_id, share_scope, team_id, access_level, expires_timestamp
+            FROM memory_sharing
+        ''')
+        for memory_id, owner, share_scope, team_id, access_level, expires_timestamp in rows:
+            cache.owners.setdefault(memory_id, set()).add(owner)
+            if share_scope not in ('team', 'public'):
+                continue
+            if expires_timestamp is None:
+                expires_at = None
+            elif expires_timestamp > now:
+                try:
+                    expires_at = datetime.fromisoformat(expires_timestamp).timestamp()
+                except ValueError:
+                    continue  # fail closed on unreadable expiry
+            else:
+                continue
+            rank = _ACCESS_LEVEL_RANK_BY_VALUE.get(access_level)
+            if rank is not None:
+                cache.grants.setdefault(memory_id, []).append((team_id, rank, expires_at))
+        
+        return cache
+    
+    def can_access(self, user_id: str, memory_id: str, required_rank: int, now: float = None) -> bool:
+        owners = self.owners.get(memory_id)
+        if owners is not None and user_id in owners:
+            return True
+        
+        grants = self.grants.get(memory_id)
+        if not grants:
+            return False
+        
+        now = time.time() if now is None else now
+        teams = self.memberships.get(user_id, ())
+        for team_id, rank, expires_at in grants:
+            if expires_at is not None and expires_at <= now:
+                continue
+            # Team-scoped grants need membership in that team
+            if team_id and team_id not in teams:
+                continue
+            if rank >= required_rank:
+                return True
+        return False
+
+def encode_log_metadata(metadata: Optional[Dict]) -> Optional[bytes]:
+    """Compact BLOB form of access-log metadata: NULL when empty, else tagged JSON bytes.
+    
+    ``b"j"`` prefixes minified JSON; ``b"z"`` prefixes zlib-compressed JSON,
+    used once the payload reaches ``METADATA_COMPRESS_THRESHOLD`` bytes.
+    """
+    if not metadata:
+        return None
+    raw = json.dumps(metadata, separators=(',', ':'), default=str).encode('utf-8')
+    if len(raw) >= METADATA_COMPRESS_THRESHOLD:
+        packed = zlib.compress(raw)
+        if len(packed) < len(raw):
+            return b'z' + packed
+    return b'j' + raw
+
+def decode_log_metadata(value) -> Dict:
+    """Inverse of ``encode_log_metadata``; also reads the older JSON text rows"""
+    if value is None:
+        return {}
+    if isinstance(value, str):
+        return json.loads(value)
+    tag, body = value[:1], value[1:]
+    if tag == b'z':
+        body = zlib.decompress(body)
+    return json.loads(body)
+
+class TeamAccessLogger(WriteBehindQueue):
+    """Write-behind ``team_access_log`` writer.
+    
+    ``log`` only enqueues the event; metadata is encoded and queued events
+    are inserted in one transaction on the background writer. Failed
+    batches are retried before being counted as failed, so the audit trail
+    is not silently thinned out.
+    """
+    
+    def __init__(self, db: SQLiteConnectionManager, max_pending: int = ACCESS_LOG_BUFFER_SIZE,
+                 batch_size: int = ACCESS_LOG_BATCH_SIZE,
+                 flush_interval: float = ACCESS_LOG_FLUSH_INTERVAL_SECONDS):
+        self.db = db
+        super().__init__(self._insert, max_pending, batch_size, flush_interval,
+                         name="team-access-logger", attempts=ACCESS_LOG_WRITE_ATTEMPTS)
+    
+    def log(self, memory_id: str, user_id: str, team_id: str = None, action: str = "view",
+            metadata: Dict = None, timeout: float = None):
+        """Queue an access event, blocking while the buffer is full"""
+        self.put((memory_id, user_id, team_id, action, datetime.now().isoformat(),
+                  dict(metadata) if metadata else None), timeout=timeout)
+    
+    def _insert(self, batch: List[tuple]):
+        rows = [event[:5] + (encode_log_metadata(event[5]),) for event in batch]
+        with self.db.writer() as conn:
+            conn.executemany(INSERT_TEAM_ACCESS_LOG_SQL, rows)
+
 class TeamMemoryManager:
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, pool_size: int = 4, buffered_log: bool = True):
+        """Open the team database.
+        
+        Permission checks are answered from a ``TeamACLCache`` snapshot. Every
+        membership or share change bumps ``acl_generation``, and the snapshot
+        is rebuilt on the next check after a bump (or once it is older than
+        ``ACL_CACHE_MAX_AGE_SECONDS``).
+        
+        By default ``log_team_access`` hands events to a ``TeamAccessLogger``
+        instead of committing each one; ``close()`` (or interpreter exit)
+        writes out whatever is still queued. Pass ``buffered_log=False`` to
+        commit every event before returning.
+        """
         self.db_path = db_path
+        self.db = SQLiteConnectionManager(db_path, pool_size=pool_size)
+        self.acl_generation = 0
+        self._acl_cache: Optional[TeamACLCache] = None
+        self._acl_lock = threading.Lock()
+        self._sweeper_stop = threading.Event()
+        self._sweeper_thread = None
         self.init_team_db()
+        self.access_logger = TeamAccessLogger(self.db) if buffered_log else None
+    
+    def close(self):
+        """Stop background jobs, write out buffered log events and release connections"""
+        self.stop_share_sweeper()
+        if self.access_logger:
+            self.access_logger.close()
+        self.db.close()
+    
+    def invalidate_acl(self):
+        """Mark the cached ACL snapshot stale after a membership or share change"""
+        with self._acl_lock:
+            self.acl_generation += 1
+    
+    def acl_cache(self) -> TeamACLCache:
+        """Current ACL snapshot, rebuilt if the generation moved on or it aged out"""
+        cache = self._acl_cache
+        if cache is not None and cache.generation == self.acl_generation and \
+                time.monotonic() - cache.built_at < ACL_CACHE_MAX_AGE_SECONDS:
+            return cache
+        
+        with self._acl_lock:
+            cache = self._acl_cache
+            generation = self.acl_generation
+            if cache is None or cache.generation != generation or \
+                    time.monotonic() - cache.built_at >= ACL_CACHE_MAX_AGE_SECONDS:
+                with self.db.reader() as conn:
+                    cache = TeamACLCache.load(conn, generation)
+                self._acl_cache = cache
+        return cache
     
     def init_team_db(self):
-        """Initialize team memory sharing database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        """Initialize team memory sharing database and bring its schema up to date"""
+        with self.db.writer() as conn:
+            self.schema_version = apply_migrations(conn, "team", [
+                (1, [self._create_team_tables]),
+                (2, [
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_memory_sharing_owner
+                    ON memory_sharing (owner_user_id)
+                    ''',
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_memory_sharing_team_scope
+                    ON memory_sharing (team_id, share_scope)
+                    ''',
+                    # The public branch of ACCESSIBLE_MEMORIES_SQL needs share_scope rows in
+                    # id order; (share_scope) alone has the rowid as its implicit suffix, so
+                    # id > :after_id seeks and LIMIT ends the scan. Expiry is checked per row.
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_memory_sharing_scope
+                    ON memory_sharing (share_scope)
+                    ''',
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_team_members_team_user
+                    ON team_members (team_id, user_id)
+                    '''
+                ]),
+                (3, [
+                    # Only expiring shares are indexed; the sweeper walks it oldest first
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_memory_sharing_expiry
+                    ON memory_sharing (expires_timestamp)
+                    WHERE expires_timestamp IS NOT NULL
+                    ''',
+                    '''
+                    CREATE TABLE IF NOT EXISTS memory_sharing_archive (
+                        id INTEGER PRIMARY KEY,
+                        memory_id TEXT,
+                        owner_user_id TEXT,
+                        share_scope TEXT,
+                        team_id TEXT,
+                        access_level TEXT,
+                        shared_timestamp TEXT,
+                        expires_timestamp TEXT,
+                        settings TEXT,
+                        archived_timestamp TEXT
+                    )
+                    '''
+                ]),
+                (4, [
+                    '''
+                    CREATE INDEX IF NOT EXISTS idx_team_access_log_timestamp
+                    ON team_access_log (timestamp)
+                    '''
+                ])
+            ])
+    
+    def _create_team_tables(self, cursor):
         # Teams table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS teams (
@@ -84,7 +381,7 @@ class TeamMemoryManager:
                 team_id TEXT,
                 action TEXT,  -- view, edit, share, unshare
                 timestamp TEXT,
-                metadata TEXT  -- JSON
+                metadata TEXT  -- encode_log_metadata() BLOB (JSON text in older rows)
             )
         ''')
         
@@ -101,36 +398,31 @@ class TeamMemoryManager:
                 metadata TEXT  -- JSON
             )
         ''')
-        
-        conn.commit()
-        conn.close()
     
     def create_team(self, team_name: str, description: str, created_by: str,
                    settings: Dict = None) -> str:
         """Create a new team"""
         team_id = str(uuid.uuid4())
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO teams (team_id, team_name, description, created_by, created_timestamp, settings)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            team_id, team_name, description, created_by,
-            datetime.now().isoformat(),
-            json.dumps(settings or {})
-        ))
-        
-        # Add creator as owner
-        cursor.execute('''
-            INSERT INTO team_members (team_id, user_id, access_level, joined_timestamp, invited_by)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (team_id, created_by, AccessLevel.OWNER.value, datetime.now().isoformat(), created_by))
-        
-        conn.commit()
-        conn.close()
+        with self.db.writer() as conn:
+            cursor = conn.cursor()
+            
+            cursor.execute('''
+                INSERT INTO teams (team_id, team_name, description, created_by, created_timestamp, settings)
+                VALUES (?, ?, ?, ?, ?, ?)
+            ''', (
+                team_id, team_name, description, created_by,
+                datetime.now().isoformat(),
+                json.dumps(settings or {})
+            ))
+            
+            # Add creator as owner
+            cursor.execute('''
+                INSERT INTO team_members (team_id, user_id, access_level, joined_timestamp, invited_by)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (team_id, created_by, AccessLevel.OWNER.value, datetime.now().isoformat(), created_by))
         
+        self.invalidate_acl()
         return team_id
     
     def add_team_member(self, team_id: str, user_id: str, access_level: AccessLevel,
@@ -140,18 +432,14 @@ class TeamMemoryManager:
         if not self.has_permission(invited_by, team_id, AccessLevel.ADMIN):
             return False
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO team_members 
-            (team_id, user_id, access_level, joined_timestamp, invited_by)
-            VALUES (?, ?, ?, ?, ?)
-        ''', (team_id, user_id, access_level.value, datetime.now().isoformat(), invited_by))
-        
-        conn.commit()
-        conn.close()
+        with self.db.writer() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO team_members 
+                (team_id, user_id, access_level, joined_timestamp, invited_by)
+                VALUES (?, ?, ?, ?, ?)
+            ''', (team_id, user_id, access_level.value, datetime.now().isoformat(), invited_by))
         
+        self.invalidate_acl()
         return True
     
     def share_memory(self, memory_id: str, owner_user_id: str, share_scope: ShareScope,
@@ -168,22 +456,18 @@ class TeamMemoryManager:
         if expires_hours:
             expires_timestamp = (datetime.now() + timedelta(hours=expires_hours)).isoformat()
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO memory_sharing 
-            (memory_id, owner_user_id, share_scope, team_id, access_level, 
-             shared_timestamp, expires_timestamp, settings)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            memory_id, owner_user_id, share_scope.value, team_id,
-            access_level.value, datetime.now().isoformat(),
-            expires_timestamp, json.dumps({})
-        ))
-        
-        conn.commit()
-        conn.close()
+        with self.db.writer() as conn:
+            conn.execute('''
+                INSERT OR REPLACE INTO memory_sharing 
+                (memory_id, owner_user_id, share_scope, team_id, access_level, 
+                 shared_timestamp, expires_timestamp, settings)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                memory_id, owner_user_id, share_scope.value, team_id,
+                access_level.value, datetime.now().isoformat(),
+                expires_timestamp, json.dumps({})
+            ))
+        self.invalidate_acl()
         
         # Log sharing action
         self.log_team_access(memory_id, owner_user_id, team_id, "share")
@@ -196,150 +480,99 @@ class TeamMemoryManager:
             "expires_timestamp": expires_timestamp
         }
     
-    def get_accessible_memories(self, user_id: str, team_id: str = None) -> List[Dict]:
-        """Get memories accessible to user"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def get_accessible_memories(self, user_id: str, team_id: str = None,
+                                limit: int = None, after_id: int = 0) -> List[Dict]:
+        """Get memories accessible to user.
+        
+        Rows come back in share id order. With ``limit`` only one page is
+        returned; pass the last entry's ``share_id`` as ``after_id`` to get the
+        next one. Use ``iter_accessible_memories`` to stream everything.
+        """
+        if limit is None:
+            return list(self.iter_accessible_memories(user_id, team_id, after_id=after_id))
+        
+        with self.db.reader() as conn:
+            return self._accessible_page(conn, user_id, team_id, after_id, limit, datetime.now().isoformat())
+    
+    def iter_accessible_memories(self, user_id: str, team_id: str = None,
+                                 page_size: int = ACCESSIBLE_PAGE_SIZE,
+                                 after_id: int = 0) -> Iterator[Dict]:
+        """Stream accessible memories one keyset page at a time"""
+        now = datetime.now().isoformat()
+        while True:
+            # A fresh reader per page, so no connection is held while the caller consumes rows
+            with self.db.reader() as conn:
+                page = self._accessible_page(conn, user_id, team_id, after_id, page_size, now)
+            yield from page
+            if len(page) < page_size:
+                return
+            after_id = page[-1]["share_id"]
+    
+    def _accessible_page(self, conn, user_id: str, team_id: Optional[str], after_id: int,
+                         limit: int, now: str) -> List[Dict]:
+        rows = conn.execute(ACCESSIBLE_MEMORIES_SQL, {
+            "user_id": user_id,
+            "team_id": team_id,
+            "after_id": after_id,
+            "now": now,
+            "limit": limit
+        }).fetchall()
         
         accessible_memories = []
+        for share_id, memory_id, share_scope, access_level, shared_timestamp, owner, access_type in rows:
+            entry = {
+                "share_id": share_id,
+                "memory_id": memory_id,
+                "access_type": access_type,
+                "share_scope": share_scope,
+                "access_level": "owner" if access_type == "owner" else access_level,
+                "shared_timestamp": shared_timestamp
+            }
+            if access_type != "owner":
+                entry["owner"] = owner
+            accessible_memories.append(entry)
         
-        # Personal memories (owned by user)
-        cursor.execute('''
-            SELECT memory_id, share_scope, access_level, shared_timestamp
-            FROM memory_sharing 
-            WHERE owner_user_id = ?
-        ''', (user_id,))
-        
-        for row in cursor.fetchall():
-            accessible_memories.append({
-                "memory_id": row[0],
-                "access_type": "owner",
-                "share_scope": row[1],
-                "access_level": "owner",
-                "shared_timestamp": row[3]
-            })
-        
-        # Team memories (if user is team member)
-        if team_id and self.is_team_member(user_id, team_id):
-            cursor.execute('''
-                SELECT ms.memory_id, ms.share_scope, ms.access_level, ms.shared_timestamp,
-                       ms.owner_user_id
-                FROM memory_sharing ms
-                WHERE ms.team_id = ? AND ms.share_scope = 'team'
-                AND (ms.expires_timestamp IS NULL OR ms.expires_timestamp > ?)
-            ''', (team_id, datetime.now().isoformat()))
-            
-            for row in cursor.fetchall():
-                if row[4] != user_id:  # Don't duplicate owned memories
-                    accessible_memories.append({
-                        "memory_id": row[0],
-                        "access_type": "team_shared",
-                        "share_scope": row[1],
-                        "access_level": row[2],
-                        "shared_timestamp": row[3],
-                        "owner": row[4]
-                    })
-        
-        # Public memories
-        cursor.execute('''
-            SELECT memory_id, share_scope, access_level, shared_timestamp, owner_user_id
-            FROM memory_sharing 
-            WHERE share_scope = 'public'
-            AND (expires_timestamp IS NULL OR expires_timestamp > ?)
-        ''', (datetime.now().isoformat(),))
-        
-        for row in cursor.fetchall():
-            if row[4] != user_id:  # Don't duplicate owned memories
-                accessible_memories.append({
-                    "memory_id": row[0],
-                    "access_type": "public",
-                    "share_scope": row[1],
-                    "access_level": row[2],
-                    "shared_timestamp": row[3],
-                    "owner": row[4]
-                })
-        
-        conn.close()
         return accessible_memories
     
     def can_access_memory(self, user_id: str, memory_id: str, 
                          required_level: AccessLevel = AccessLevel.READ) -> bool:
         """Check if user can access memory with required permission level"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Check if user owns the memory
-        cursor.execute('''
-            SELECT 1 FROM memory_sharing 
-            WHERE memory_id = ? AND owner_user_id = ?
-        ''', (memory_id, user_id))
-        
-        if cursor.fetchone():
-            conn.close()
-            return True
-        
-        # Check team access
-        cursor.execute('''
-            SELECT ms.access_level, ms.team_id
-            FROM memory_sharing ms
-            WHERE ms.memory_id = ? 
-            AND ms.share_scope IN ('team', 'public')
-            AND (ms.expires_timestamp IS NULL OR ms.expires_timestamp > ?)
-        ''', (memory_id, datetime.now().isoformat()))
-        
-        for row in cursor.fetchall():
-            access_level_str, team_id = row
-            
-            # For team memories, check membership
-            if team_id and not self.is_team_member(user_id, team_id):
-                continue
-            
-            # Check access level hierarchy
-            access_level = AccessLevel(access_level_str)
-            if self.access_level_sufficient(access_level, required_level):
-                conn.close()
-                return True
-        
-        conn.close()
-        return False
+        return self.acl_cache().can_access(user_id, memory_id, ACCESS_LEVEL_RANK[required_level])
+    
+    def filter_accessible(self, user_id: str, memory_ids: Iterable[str],
+                          required_level: AccessLevel = AccessLevel.READ) -> List[str]:
+        """Subset of ``memory_ids`` the user may access, in input order.
+        
+        The whole batch is checked against one ACL snapshot, so filtering a
+        page of search hits costs no database round trips.
+        """
+        acl = self.acl_cache()
+        required_rank = ACCESS_LEVEL_RANK[required_level]
+        now = time.time()
+        return [memory_id for memory_id in memory_ids
+                if acl.can_access(user_id, memory_id, required_rank, now)]
     
     def access_level_sufficient(self, granted: AccessLevel, required: AccessLevel) -> bool:
         """Check if granted access level is sufficient for required level"""
-        hierarchy = {
-            AccessLevel.READ: 1,
-            AccessLevel.WRITE: 2,
-            AccessLevel.ADMIN: 3,
-            AccessLevel.OWNER: 4
-        }
-        return hierarchy[granted] >= hierarchy[required]
+        return ACCESS_LEVEL_RANK[granted] >= ACCESS_LEVEL_RANK[required]
     
     def is_team_member(self, user_id: str, team_id: str) -> bool:
         """Check if user is a team member"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT 1 FROM team_members 
-            WHERE user_id = ? AND team_id = ?
-        ''', (user_id, team_id))
-        
-        result = cursor.fetchone()
-        conn.close()
+        with self.db.reader() as conn:
+            result = conn.execute('''
+                SELECT 1 FROM team_members 
+                WHERE user_id = ? AND team_id = ?
+            ''', (user_id, team_id)).fetchone()
         
         return result is not None
     
     def has_permission(self, user_id: str, team_id: str, required_level: AccessLevel) -> bool:
         """Check if user has required permission level in team"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT access_level FROM team_members 
-            WHERE user_id = ? AND team_id = ?
-        ''', (user_id, team_id))
-        
-        result = cursor.fetchone()
-        conn.close()
+        with self.db.reader() as conn:
+            result = conn.execute('''
+                SELECT access_level FROM team_members 
+                WHERE user_id = ? AND team_id = ?
+            ''', (user_id, team_id)).fetchone()
         
         if not result:
             return False
@@ -347,24 +580,167 @@ class TeamMemoryManager:
         user_level = AccessLevel(result[0])
         return self.access_level_sufficient(user_level, required_level)
     
+    def sweep_expired_shares(self, batch_size: int = SHARE_SWEEP_BATCH_SIZE,
+                             archive: bool = True) -> Dict[str, Any]:
+        """Revoke expired shares in batches, oldest expiry first.
+        
+        Each batch is one transaction that copies the rows to
+        ``memory_sharing_archive`` (unless ``archive`` is False), revokes
+        them and logs one ``unshare`` event per share to ``team_access_log``.
+        A share row is often the only record of who owns a memory, so an
+        expired share is downgraded to a non-expiring personal row unless the
+        owner still holds another live row for that memory, in which case it
+        is deleted. The ACL cache is invalidated after every batch.
+        """
+        now = datetime.now().isoformat()
+        swept = 0
+        
+        while True:
+            with self.db.writer() as conn:
+                rows = conn.execute('''
+                    SELECT id, memory_id, owner_user_id, team_id, share_scope, expires_timestamp
+                    FROM memory_sharing
+                    WHERE expires_timestamp IS NOT NULL AND expires_timestamp <= ?
+                    ORDER BY expires_timestamp
+                    LIMIT ?
+                ''', (now, batch_size)).fetchall()
+                if not rows:
+                    break
+                
+                ids = [(row[0],) for row in rows]
+                if archive:
+                    conn.executemany('''
+                        INSERT OR REPLACE INTO memory_sharing_archive
+                        (id, memory_id, owner_user_id, share_scope, team_id, access_level,
+                         shared_timestamp, expires_timestamp, settings, archived_timestamp)
+                        SELECT id, memory_id, owner_user_id, share_scope, team_id, access_level,
+                               shared_timestamp, expires_timestamp, settings, ?
+                        FROM memory_sharing WHERE id = ?
+                    ''', [(now, share_id) for (share_id,) in ids])
+                # Row by row, so of several expired rows for one memory only the first is kept
+                conn.executemany('''
+                    UPDATE memory_sharing
+                    SET share_scope = ?, team_id = NULL, expires_timestamp = NULL
+                    WHERE id = ? AND NOT EXISTS (
+                        SELECT 1 FROM memory_sharing AS other
+                        WHERE other.owner_user_id = memory_sharing.owner_user_id
+                        AND other.memory_id = memory_sharing.memory_id
+                        AND other.id != memory_sharing.id
+                        AND (other.expires_timestamp IS NULL OR other.expires_timestamp > ?)
+                    )
+                ''', [(ShareScope.PERSONAL.value, share_id, now) for (share_id,) in ids])
+                conn.executemany('''
+                    DELETE FROM memory_sharing WHERE id = ? AND expires_timestamp IS NOT NULL
+                ''', ids)
+                conn.executemany(INSERT_TEAM_ACCESS_LOG_SQL, [
+                    (memory_id, owner, team_id, "unshare", now, encode_log_metadata({
+                        "reason": "expired",
+                        "share_id": share_id,
+                        "share_scope": share_scope,
+                        "expires_timestamp": expires_timestamp
+                    }))
+                    for share_id, memory_id, owner, team_id, share_scope, expires_timestamp in rows
+                ])
+            
+            self.invalidate_acl()
+            swept += len(rows)
+            if len(rows) < batch_size:
+                break
+        
+        return {"swept_shares": swept, "archived": archive, "swept_before": now}
+    
+    def start_share_sweeper(self, interval_seconds: float = SHARE_SWEEP_INTERVAL_SECONDS,
+                            archive: bool = True):
+        """Sweep expired shares and partition old access-log rows on a background thread"""
+        if self._sweeper_thread is not None and self._sweeper_thread.is_alive():
+            return
+        
+        self._sweeper_stop.clear()
+        
+        def run():
+            while not self._sweeper_stop.wait(interval_seconds):
+                try:
+                    result = self.sweep_expired_shares(archive=archive)
+                    if result["swept_shares"]:
+                        logger.info("Expired share sweep: %s", result)
+                except Exception:
+                    logger.exception("Expired share sweep failed")
+                try:
+                    result = self.compact_team_access_log()
+                    if result["archived_log_rows"] or result["dropped_partitions"]:
+                        logger.info("Team access log compaction: %s", result)
+                except Exception:
+                    logger.exception("Team access log compaction failed")
+        
+        self._sweeper_thread = threading.Thread(target=run, name="team-share-sweeper", daemon=True)
+        self._sweeper_thread.start()
+    
+    def stop_share_sweeper(self):
+        """Stop the background share sweeper and wait for it to finish"""
+        self._sweeper_stop.set()
+        if self._sweeper_thread is not None:
+            self._sweeper_thread.join()
+            self._sweeper_thread = None
+    
     def log_team_access(self, memory_id: str, user_id: str, team_id: str = None,
                        action: str = "view", metadata: Dict = None):
-        """Log team memory access"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT INTO team_access_log 
-            (memory_id, user_id, team_id, action, timestamp, metadata)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            memory_id, user_id, team_id, action,
-            datetime.now().isoformat(),
-            json.dumps(metadata or {})
-        ))
-        
-        conn.commit()
-        conn.close()
+        """Log team memory access (queued for the background writer when buffered)"""
+        if self.access_logger:
+            self.access_logger.log(memory_id, user_id, team_id, action, metadata)
+            return
+        
+        with self.db.writer() as conn:
+            conn.execute(INSERT_TEAM_ACCESS_LOG_SQL, (
+                memory_id, user_id, team_id, action,
+                datetime.now().isoformat(),
+                encode_log_metadata(metadata)
+            ))
+    
+    def flush_access_log(self):
+        """Wait until every buffered access event is in team_access_log"""
+        if self.access_logger:
+            self.access_logger.flush()
+    
+    def get_access_history(self, memory_id: str, limit: int = 100) -> List[Dict]:
+        """Most recent access-log entries for a memory, newest first (hot rows only)"""
+        self.flush_access_log()
+        with self.db.reader() as conn:
+            rows = conn.execute('''
+                SELECT user_id, team_id, action, timestamp, metadata
+                FROM team_access_log
+                WHERE memory_id = ?
+                ORDER BY timestamp DESC
+                LIMIT ?
+            ''', (memory_id, limit)).fetchall()
+        
+        return [{
+            "memory_id": memory_id,
+            "user_id": user_id,
+            "team_id": team_id,
+            "action": action,
+            "timestamp": timestamp,
+            "metadata": decode_log_metadata(metadata)
+        } for user_id, team_id, action, timestamp, metadata in rows]
+    
+    def compact_team_access_log(self, hot_days: int = ACCESS_LOG_HOT_DAYS,
+                                retention_days: int = ACCESS_LOG_PARTITION_RETENTION_DAYS) -> Dict[str, Any]:
+        """Roll team_access_log rows older than ``hot_days`` into daily partitions.
+        
+        Partitions are kept forever unless ``retention_days`` is 0 or more,
+        in which case those older than that are dropped.
+        """
+        now = datetime.now()
+        cutoff = (now - timedelta(days=hot_days)).isoformat()
+        archived_rows = archive_before(self.db, "team_access_log", "timestamp", cutoff, "daily")
+        
+        dropped_partitions = []
+        if retention_days >= 0:
+            with self.db.writer() as conn:
+                dropped_partitions = drop_partitions_before(
+                    conn, "team_access_log", now.date() - timedelta(days=retention_days)
+                )
+        
+        return {'archived_log_rows': archived_rows, 'dropped_partitions': dropped_partitions}
 
 if __name__ == "__main__":
     # Test team memory system
@@ -389,3 +765,5 @@ if __name__ == "__main__":
     )
     
     print(f"Share result: {share_result}")
+    
+    team_manager.close()